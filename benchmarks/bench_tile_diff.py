@@ -0,0 +1,88 @@
+import io
+import sys
+import json
+import time
+import argparse
+
+from PIL import Image
+
+from masking.tile_diff import TileDiffCache, encode_png
+from benchmarks.corpus import SCREENSHOT_SEQUENCES, screenshot_sequence
+
+
+def server_ms(pixels, base_ms, ms_per_mpx):
+    return base_ms + ms_per_mpx * pixels / 1_000_000
+
+
+def run_sequence(images, base_ms, ms_per_mpx):
+    cache = TileDiffCache()
+    full = {"bytes": 0, "server_ms": 0.0}
+    tiled = {"bytes": 0, "server_ms": 0.0, "local_ms": 0.0, "reuse": 0, "region": 0, "full": 0}
+
+    for image in images:
+        png = encode_png(image)
+        full["bytes"] += len(png)
+        full["server_ms"] += server_ms(image.width * image.height, base_ms, ms_per_mpx)
+
+        start = time.perf_counter()
+        plan = cache.plan(image, frozenset({"PERSON"}))
+        tiled[plan.kind] += 1
+        masked = None
+        if plan.kind == "full":
+            upload = png
+            masked = image
+        elif plan.kind == "region":
+            crop = image.crop(plan.box)
+            upload = encode_png(crop)
+            masked = Image.open(io.BytesIO(upload))
+        else:
+            upload = b""
+        if upload:
+            pixels = (plan.box[2] - plan.box[0]) * (plan.box[3] - plan.box[1]) if plan.box else image.width * image.height
+            tiled["bytes"] += len(upload)
+            tiled["server_ms"] += server_ms(pixels, base_ms, ms_per_mpx)
+        result = cache.compose(plan, masked)
+        cache.remember(plan, result)
+        tiled["local_ms"] += (time.perf_counter() - start) * 1000
+
+    return full, tiled
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="연속 스크린샷 타일 비교 업로드량/서버 시간 벤치마크")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-ms", type=float, default=150.0, help="OCR 요청당 고정 서버 시간")
+    parser.add_argument("--ms-per-mpx", type=float, default=900.0, help="메가픽셀당 OCR 서버 시간")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in SCREENSHOT_SEQUENCES:
+        images = screenshot_sequence(name, args.frames, args.seed)
+        full, tiled = run_sequence(images, args.base_ms, args.ms_per_mpx)
+        results[name] = {
+            "frames": len(images),
+            "full_bytes": full["bytes"],
+            "tiled_bytes": tiled["bytes"],
+            "bytes_ratio": round(tiled["bytes"] / full["bytes"], 3),
+            "full_server_ms": round(full["server_ms"], 1),
+            "tiled_server_ms": round(tiled["server_ms"], 1),
+            "server_ms_ratio": round(tiled["server_ms"] / full["server_ms"], 3),
+            "local_ms_per_frame": round(tiled["local_ms"] / len(images), 2),
+            "plans": {kind: tiled[kind] for kind in ("full", "region", "reuse")},
+        }
+
+    if args.json:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+
+    for name, r in results.items():
+        print(f"{name:16s} bytes {r['full_bytes']:>10d} -> {r['tiled_bytes']:>10d} ({r['bytes_ratio']:.1%})  "
+              f"server {r['full_server_ms']:>8.0f}ms -> {r['tiled_server_ms']:>8.0f}ms ({r['server_ms_ratio']:.1%})  "
+              f"local {r['local_ms_per_frame']:.1f}ms/frame  plans {r['plans']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+import io
+import csv
+import json
+import math
+import wave
+import random
+import struct
+
+KO_NAMES = ["홍길동", "김희정", "이서연", "박지훈", "최민준", "정다은", "강하늘", "윤서준"]
+KO_PLACES = ["서울시 강남구", "부산", "대전", "판교", "제주도", "인천공항", "광화문"]
+KO_ORGS = ["삼성전자", "네이버", "카카오", "서울대학교", "국민은행", "현대자동차"]
+KO_DATES = ["2025년 3월 14일", "4월 2일", "2024년 12월 25일", "내일", "다음 주 월요일"]
+KO_TIMES = ["오후 3시", "오전 10시 30분", "저녁 7시", "정오"]
+
+EN_NAMES = ["John Smith", "Emily Clark", "Michael Brown", "Sarah Lee", "David Kim"]
+EN_PLACES = ["New York", "Seattle", "London", "San Francisco", "Berlin"]
+EN_ORGS = ["Google", "Microsoft", "Acme Corp", "OpenMind Labs", "Initech"]
+EN_DATES = ["March 3rd", "next Friday", "2025-06-01", "June 12"]
+
+# 가짜 NER 서버가 인식하는 단어 사전 (단어 -> 태그)
+VOCABULARY = {}
+for _words, _tag in [(KO_NAMES + EN_NAMES, "PERSON"), (KO_PLACES + EN_PLACES, "LOCATION"),
+                     (KO_ORGS + EN_ORGS, "ORGANIZATION"), (KO_DATES + EN_DATES, "DATE"),
+                     (KO_TIMES, "TIME")]:
+    for _word in _words:
+        VOCABULARY[_word] = _tag
+
+KO_TEMPLATES = [
+    "{name}님이 {date} {time}에 {place}에 있는 {org} 사무실을 방문했습니다.",
+    "연락처는 {phone}이고 이메일은 {email} 입니다.",
+    "{name} 고객의 주민등록번호는 {ssn} 입니다. {org} 담당자에게 전달해 주세요.",
+    "오늘 회의는 {place}에서 {time}에 시작합니다. 참석자: {name}, {name2}",
+    "배송지: {place}, 수령인 {name}, 전화 {phone}",
+]
+EN_TEMPLATES = [
+    "{name} from {org} will meet us in {place} on {date}.",
+    "Please call {phone} or email {email} before {date}.",
+    "Customer {name} reported an issue with the {org} account, ssn {ssn}.",
+    "Meeting notes: {name} and {name2} agreed to move the launch to {date} in {place}.",
+]
+
+
+def random_phone(rng):
+    return f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+
+
+def random_email(rng):
+    user = rng.choice(["hong", "kim.hj", "sarah.lee", "dev", "admin", "j.smith"])
+    domain = rng.choice(["example.com", "naver.com", "gmail.com", "company.co.kr"])
+    return f"{user}{rng.randint(1, 999)}@{domain}"
+
+
+def random_ssn(rng):
+    return f"{rng.randint(600101, 991231)}-{rng.randint(1000000, 4999999)}"
+
+
+def sentence(rng, lang="ko"):
+    if lang == "ko":
+        template = rng.choice(KO_TEMPLATES)
+        names, places, orgs, dates = KO_NAMES, KO_PLACES, KO_ORGS, KO_DATES
+    else:
+        template = rng.choice(EN_TEMPLATES)
+        names, places, orgs, dates = EN_NAMES, EN_PLACES, EN_ORGS, EN_DATES
+    return template.format(
+        name=rng.choice(names), name2=rng.choice(names), place=rng.choice(places),
+        org=rng.choice(orgs), date=rng.choice(dates), time=rng.choice(KO_TIMES),
+        phone=random_phone(rng), email=random_email(rng), ssn=random_ssn(rng),
+    )
+
+
+def text_corpus(count, lang="ko", sentences=4, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(sentence(rng, lang) for _ in range(sentences)) for _ in range(count)]
+
+
+CODE_TEMPLATES = [
+    'API_KEY = "{key}"\nBASE_URL = "https://api.{host}/v1"\nclient = Client(API_KEY, BASE_URL)\n',
+    'const config = {{\n  "secret_token": "{key}",\n  "endpoint": "https://{host}/graphql",\n  "owner": "{email}"\n}};\n',
+    '#define AUTH_TOKEN "{key}"\n#define SERVER_URL "https://{host}"\nint main() {{ return connect(SERVER_URL); }}\n',
+    'DATABASE_URL="postgres://admin:{key}@{host}:5432/app"\nSTRIPE_SECRET_KEY="{key}"\nADMIN_EMAIL="{email}"\n',
+    'settings.aws.access_key = "{key}"\nsettings.contact = "{email}"\nprint("done")\n',
+]
+
+
+def random_key(rng):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789") for _ in range(32))
+
+
+def code_corpus(count, seed=0):
+    rng = random.Random(seed)
+    snippets = []
+    for _ in range(count):
+        parts = [rng.choice(CODE_TEMPLATES).format(
+            key=random_key(rng), host=rng.choice(["example.com", "internal.corp", "api.test.io"]),
+            email=random_email(rng)) for _ in range(3)]
+        snippets.append("\n".join(parts))
+    return snippets
+
+
+def terminal_corpus(count, lines=30, seed=0):
+    rng = random.Random(seed)
+    users = ["hong", "heejung", "gaeul", "jayeon"]
+    transcripts = []
+    for _ in range(count):
+        user = rng.choice(users)
+        out = []
+        for _ in range(lines):
+            kind = rng.random()
+            if kind < 0.25:
+                out.append(f"(venv) {user}@MacBook-Pro project/app %")
+            elif kind < 0.4:
+                out.append(f"C:\\Users\\{user}\\Documents\\erase-me>")
+            elif kind < 0.7:
+                out.append(f'  File "/Users/{user}/project/app/main.py", line {rng.randint(1, 400)}, in <module>')
+            else:
+                out.append(f"ERROR: request failed for {random_email(rng)} ({rng.randint(100, 999)} ms)")
+        transcripts.append("\n".join(out))
+    return transcripts
+
+
+def structured_record(rng, i):
+    return {
+        "id": i,
+        "name": rng.choice(KO_NAMES),
+        "email": random_email(rng),
+        "phone": random_phone(rng),
+        "status": rng.choice(["active", "pending", "closed"]),
+        "amount": rng.randint(1000, 99999),
+        "created_at": f"2025-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T0{rng.randint(0, 9)}:00:00Z",
+        "memo": sentence(rng, "ko"),
+    }
+
+
+def structured_corpus(count, kind="json", records=50, seed=0):
+    # API 응답(JSON), JSON lines, CSV 내보내기, 키=값 로그 형태의 복사 텍스트
+    rng = random.Random(seed)
+    blobs = []
+    for _ in range(count):
+        rows = [structured_record(rng, i) for i in range(records)]
+        if kind == "json":
+            blobs.append(json.dumps({"count": len(rows), "items": rows}, ensure_ascii=False, indent=2))
+        elif kind == "jsonl":
+            blobs.append("\n".join(json.dumps(row, ensure_ascii=False) for row in rows))
+        elif kind == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]), lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+            blobs.append(buffer.getvalue())
+        else:
+            lines = []
+            for row in rows:
+                memo = row["memo"].replace('"', "'")
+                lines.append(f'{row["created_at"]} INFO request_id={row["id"]} user={row["name"]} '
+                             f'email={row["email"]} status={row["status"]} latency_ms={row["amount"] % 500} msg="{memo}"')
+            blobs.append("\n".join(lines))
+    return blobs
+
+
+def wav_bytes(seconds, sample_rate=16000, seed=0):
+    # STT 벤치마크용 16kHz mono 16bit PCM (사인파 + 잡음)
+    rng = random.Random(seed)
+    frames = bytearray()
+    for i in range(int(seconds * sample_rate)):
+        value = 0.3 * math.sin(2 * math.pi * 220 * i / sample_rate) + 0.05 * (rng.random() - 0.5)
+        frames += struct.pack("<h", int(value * 32767))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 800
+LINE_HEIGHT = 18
+SCREEN_WORDS = ["def", "return", "self", "user_id", "홍길동", "print", "token", "config", "import",
+                "for", "in", "range", "010-1234-5678", "hong@example.com", "서울시", "None", "await"]
+
+
+def screen_line(rng):
+    return " ".join(rng.choice(SCREEN_WORDS) for _ in range(rng.randint(3, 10)))
+
+
+def render_screen(lines, background=(30, 30, 30), color=(220, 220, 220)):
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (SCREEN_WIDTH, SCREEN_HEIGHT), background)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, SCREEN_WIDTH, 30), fill=(60, 60, 60))
+    draw.text((10, 8), "Erase Me - editor", fill=color)
+    for i, line in enumerate(lines):
+        draw.text((20, 50 + i * LINE_HEIGHT), line, fill=color)
+    return image
+
+
+def ide_typing(frames, rng):
+    # 같은 편집기 화면에서 한 줄씩 수정되는 경우
+    lines = [screen_line(rng) for _ in range(38)]
+    sequence = []
+    for _ in range(frames):
+        lines[rng.randrange(len(lines))] = screen_line(rng)
+        sequence.append(render_screen(lines))
+    return sequence
+
+
+def chat_append(frames, rng):
+    # 채팅 창 아래쪽에 메시지가 하나씩 추가되는 경우
+    lines = [screen_line(rng) for _ in range(10)]
+    sequence = []
+    for _ in range(frames):
+        lines.append(screen_line(rng))
+        sequence.append(render_screen(lines[:40]))
+    return sequence
+
+
+def terminal_scroll(frames, rng):
+    # 터미널이 한 줄씩 스크롤되는 최악의 경우 (거의 모든 타일이 바뀜)
+    lines = [screen_line(rng) for _ in range(40)]
+    sequence = []
+    for _ in range(frames):
+        lines = lines[1:] + [screen_line(rng)]
+        sequence.append(render_screen(lines, background=(0, 0, 0)))
+    return sequence
+
+
+def identical(frames, rng):
+    image = render_screen([screen_line(rng) for _ in range(38)])
+    return [image.copy() for _ in range(frames)]
+
+
+SCREENSHOT_SEQUENCES = {
+    "ide_typing": ide_typing,
+    "chat_append": chat_append,
+    "terminal_scroll": terminal_scroll,
+    "identical": identical,
+}
+
+
+def screenshot_sequence(name, frames, seed=0):
+    return SCREENSHOT_SEQUENCES[name](frames, random.Random(seed))
@@ -0,0 +1,186 @@
+import io
+import re
+import json
+import time
+import threading
+from types import SimpleNamespace
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from benchmarks.corpus import VOCABULARY, KO_TEMPLATES
+
+_VOCAB_PATTERN = re.compile("|".join(re.escape(w) for w in sorted(VOCABULARY, key=len, reverse=True)))
+
+
+def fake_ner(text):
+    return [[m.group(0), VOCABULARY[m.group(0)]] for m in _VOCAB_PATTERN.finditer(text)]
+
+
+def multipart_field(content_type, body, field):
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") == field:
+            return part.get_payload(decode=True)
+    return None
+
+
+def image_pixels(data):
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(data)) as image:
+            return image.width * image.height
+    except Exception:
+        return 0
+
+
+class FakeServers:
+    # 로컬에서 NER(/ner), OCR(/ocr) 서버를 흉내내는 HTTP 서버. 지연 시간은 설정 가능
+    # ner_batching: {"texts": [...]} 여러 문서 요청 지원 여부, ner_workers: NER 을 동시에 처리하는 수 (0 이면 제한 없음)
+    # ner_unsupported_status: 여러 문서 요청을 모르는 서버가 돌려주는 상태 코드 (400, 500 등)
+    def __init__(self, ner_latency_ms=0.0, ner_ms_per_kchar=0.0, ocr_latency_ms=0.0, ocr_ms_per_mpx=0.0,
+                 ner_batching=True, ner_workers=0, ner_unsupported_status=400):
+        self.ner_latency_ms = ner_latency_ms
+        self.ner_ms_per_kchar = ner_ms_per_kchar
+        self.ocr_latency_ms = ocr_latency_ms
+        self.ocr_ms_per_mpx = ocr_ms_per_mpx
+        self.ner_batching = ner_batching
+        self.ner_unsupported_status = ner_unsupported_status
+        self.ner_slots = threading.BoundedSemaphore(ner_workers) if ner_workers else None
+        self.stats = {"ner_requests": 0, "ner_texts": 0, "ner_chars": 0, "ner_rejected": 0, "ocr_requests": 0, "ocr_bytes": 0}
+        self.lock = threading.Lock()
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def ner_url(self):
+        return self.url + "/ner"
+
+    @property
+    def ocr_url(self):
+        return self.url + "/ocr"
+
+    def count(self, **values):
+        with self.lock:
+            for key, value in values.items():
+                self.stats[key] += value
+
+    def reset_stats(self):
+        with self.lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def handle_ner(self, payload):
+        texts = payload["texts"] if "texts" in payload else [payload["text"]]
+        chars = sum(len(text) for text in texts)
+        self.count(ner_requests=1, ner_texts=len(texts), ner_chars=chars)
+        if self.ner_slots:
+            self.ner_slots.acquire()
+        try:
+            time.sleep((self.ner_latency_ms + self.ner_ms_per_kchar * chars / 1000) / 1000)
+        finally:
+            if self.ner_slots:
+                self.ner_slots.release()
+        if "texts" in payload:
+            return {"ner_results": [fake_ner(text) for text in texts]}
+        return {"ner_result": fake_ner(texts[0])}
+
+    def handle_ocr(self, image):
+        self.count(ocr_requests=1, ocr_bytes=len(image))
+        time.sleep((self.ocr_latency_ms + self.ocr_ms_per_mpx * image_pixels(image) / 1_000_000) / 1000)
+        # 받은 이미지를 그대로 돌려줌 (마스킹 결과 크기/형식만 맞추면 충분)
+        return image
+
+    def start(self):
+        servers = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # keep-alive 연결에서 헤더/본문을 나눠 보낼 때 Nagle 때문에 40ms 씩 멈추지 않도록 함
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def reply(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                try:
+                    if self.path == "/ner":
+                        payload = json.loads(body)
+                        if "texts" in payload and not servers.ner_batching:
+                            servers.count(ner_rejected=1)
+                            self.reply(servers.ner_unsupported_status, b"unknown field: texts", "text/plain")
+                            return
+                        result = servers.handle_ner(payload)
+                        self.reply(200, json.dumps(result, ensure_ascii=False).encode("utf-8"), "application/json")
+                    elif self.path == "/ocr":
+                        image = multipart_field(self.headers["Content-Type"], body, "image")
+                        if image is None:
+                            self.reply(400, b"missing image", "text/plain")
+                            return
+                        self.reply(200, servers.handle_ocr(image), "image/png")
+                    else:
+                        self.reply(404, b"not found", "text/plain")
+                except (KeyError, ValueError) as e:
+                    self.reply(400, str(e).encode("utf-8"), "text/plain")
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def fake_speech_module(latency_ms=0.0, ms_per_audio_second=0.0, transcripts=None):
+    # google.cloud.speech 대신 audio_masking.speech 에 끼워 넣는 프로세스 내 가짜 STT
+    transcripts = transcripts or [t.format(name="홍길동", name2="김희정", date="내일", time="오후 3시",
+                                           place="판교", org="네이버", phone="010-1234-5678",
+                                           email="hong@example.com", ssn="900101-1234567")
+                                  for t in KO_TEMPLATES]
+    calls = {"count": 0}
+
+    class SpeechClient:
+        def recognize(self, config, audio):
+            seconds = max(len(audio.content) - 44, 0) / (2 * config.sample_rate_hertz)
+            time.sleep((latency_ms + ms_per_audio_second * seconds) / 1000)
+            transcript = transcripts[calls["count"] % len(transcripts)]
+            calls["count"] += 1
+            alternative = SimpleNamespace(transcript=transcript)
+            return SimpleNamespace(results=[SimpleNamespace(alternatives=[alternative])])
+
+    def RecognitionConfig(**kwargs):
+        return SimpleNamespace(**kwargs)
+
+    RecognitionConfig.AudioEncoding = SimpleNamespace(LINEAR16="LINEAR16")
+
+    return SimpleNamespace(
+        SpeechClient=SpeechClient,
+        RecognitionAudio=lambda content: SimpleNamespace(content=content),
+        RecognitionConfig=RecognitionConfig,
+        calls=calls,
+    )
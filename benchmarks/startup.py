@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budgets.json")
+
+# 이름 -> (스크립트 경로, 첫 화면까지 만들지 여부)
+ENTRY_POINTS = {
+    "main": ("main.py", False),
+    "main.window": ("main.py", True),
+    "text_masking": ("masking/text_masking.pyw", False),
+    "code_masking": ("masking/code_masking.pyw", False),
+    "img_masking": ("masking/img_masking.pyw", False),
+    "audio_masking": ("masking/audio_masking.pyw", False),
+}
+
+# 스크립트를 __main__ 이 아닌 이름으로 불러와서 import 와 모듈 초기화 시간만 잼
+PROBE = """
+import os, sys, time, importlib.util, importlib.machinery
+start = time.perf_counter()
+if ".pyw" not in importlib.machinery.SOURCE_SUFFIXES:
+    # 윈도우처럼 masking/*.pyw 를 모듈로 import 할 수 있게 함
+    importlib.machinery.SOURCE_SUFFIXES.append(".pyw")
+    sys.path_importer_cache.clear()
+path, window = sys.argv[1], sys.argv[2] == "1"
+sys.path.insert(0, os.path.dirname(path))
+loader = importlib.machinery.SourceFileLoader("startup_probe", path)
+module = importlib.util.module_from_spec(importlib.util.spec_from_loader("startup_probe", loader))
+loader.exec_module(module)
+if window:
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    win = module.MainWindow()
+    app.processEvents()
+print("STARTUP_MS", (time.perf_counter() - start) * 1000)
+"""
+
+
+def parse_importtime(stderr):
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            head, cumulative, name = line.split("|")
+            self_us = int(head.split(":")[1])
+            rows.append((len(name) - len(name.lstrip()), name.strip(), self_us, int(cumulative)))
+        except ValueError:
+            continue
+    if not rows:
+        return []
+    top = min(depth for depth, *_ in rows)
+    return [(name, self_us, cumulative) for depth, name, self_us, cumulative in rows if depth == top]
+
+
+def probe(entry, runs):
+    script, window = ENTRY_POINTS[entry]
+    env = os.environ.copy()
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    process_ms, load_ms, imports = [], [], []
+    with tempfile.TemporaryDirectory(prefix="eraseme-startup-") as workdir:
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", PROBE, os.path.join(ROOT, script), "1" if window else "0"],
+                cwd=workdir, env=env, capture_output=True, text=True
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+            if result.returncode != 0:
+                last = (result.stderr.strip().splitlines() or ["?"])[-1]
+                return {"error": last}
+            process_ms.append(elapsed)
+            load_ms.append(float(result.stdout.split("STARTUP_MS")[-1]))
+            imports = parse_importtime(result.stderr)
+    imports.sort(key=lambda row: row[2], reverse=True)
+    return {
+        "process_ms": round(sorted(process_ms)[len(process_ms) // 2], 1),
+        "load_ms": round(sorted(load_ms)[len(load_ms) // 2], 1),
+        "top_imports": [{"module": name, "cumulative_ms": round(cumulative / 1000, 1)}
+                        for name, _, cumulative in imports[:10]],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="진입점별 시작 시간/import 프로파일")
+    parser.add_argument("entry", nargs="*", help=f"측정할 진입점 (기본: 전체) {sorted(ENTRY_POINTS)}")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="출력할 무거운 import 수")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--check", action="store_true", help="startup_budgets.json 예산을 넘으면 종료 코드 1")
+    args = parser.parse_args(argv)
+    unknown = [entry for entry in args.entry if entry not in ENTRY_POINTS]
+    if unknown:
+        parser.error(f"알 수 없는 진입점: {', '.join(unknown)}")
+
+    results = {entry: probe(entry, args.runs) for entry in (args.entry or ENTRY_POINTS)}
+
+    if args.json:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for entry, r in results.items():
+            if "error" in r:
+                print(f"⚠️ {entry}: 실행 불가 ({r['error']})")
+                continue
+            print(f"{entry:15s} 프로세스 {r['process_ms']:>8.1f}ms  모듈 로딩 {r['load_ms']:>8.1f}ms")
+            for row in r["top_imports"][:args.top]:
+                print(f"    {row['cumulative_ms']:>8.1f}ms  {row['module']}")
+
+    if not args.check:
+        return 0
+
+    with open(BUDGETS_FILE, "r", encoding="utf-8") as f:
+        budgets = json.load(f)
+    failed = False
+    for entry, r in results.items():
+        budget = budgets.get(entry)
+        if budget is None or "error" in r:
+            continue
+        if r["process_ms"] > budget:
+            print(f"❌ {entry}: {r['process_ms']:.1f}ms > 예산 {budget}ms")
+            failed = True
+    if not failed:
+        print("✅ 모든 진입점이 시작 시간 예산 안에 있습니다")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,58 +1,93 @@
 import sys
 import os
-import json
 import subprocess
 import datetime
-import requests
 from PyQt5.QtWidgets import QLabel, QScrollArea
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QStackedWidget, QLabel, QFileDialog, QMessageBox
 )
 from PyQt5.QtGui import QPixmap, QFont, QFontDatabase
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QTimer
 from dotenv import load_dotenv
 
-from masking.text_masking import load_mask_tags_from_selection
+from masking import instrumentation
+from masking.selection_config import current_selection, clear_selection
+from masking.task_service import default_service
 
 CREATE_NO_WINDOW = 0x08000000 
+# 업로드 요청 (연결, 응답) 제한 시간. 앱을 닫을 때 작업 스레드가 무한정 기다리지 않도록 함
+UPLOAD_TIMEOUT = (5, 60)
 
 def resource_path(relative_path):
     base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base_path, relative_path)
 
-class ImageUploadWorker(QThread):
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-
-    def __init__(self, server_url, file_path, save_folder):
-        super().__init__()
-        self.server_url = server_url
-        self.file_path = file_path
-        self.save_folder = save_folder
-
-    def run(self):
-        try:
-            with open(self.file_path, "rb") as f:
-                files = {"image": (os.path.basename(self.file_path), f, "image/png")}
-                # 추가: 선택된 태그 불러와서 서버에 함께 전달
-                mask_tags = list(load_mask_tags_from_selection())
-                data = {"mask_tags": ",".join(mask_tags)}
-
-                response = requests.post(self.server_url, files=files, data=data)
-
-            if response.status_code == 200:
-                os.makedirs(self.save_folder, exist_ok=True)
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                save_name = f"masked_{timestamp}_{os.path.basename(self.file_path)}"
-                save_path = os.path.join(self.save_folder, save_name)
-                with open(save_path, "wb") as out:
-                    out.write(response.content)
-                self.finished.emit(save_path)
-            else:
-                self.error.emit(f"❌ 서버 오류: {response.status_code}")
-        except Exception as e:
-            self.error.emit(f"❌ 요청 실패: {e}")
+# 이미지 업로드 서버 주소 (IMG_MASKING_SERVER_URL_TEXT/CODE)
+load_dotenv(dotenv_path=resource_path(".env"))
+
+class UploadError(Exception):
+    pass
+
+def upload_image_file(task, server_url, file_path, save_folder):
+    import requests
+    with open(file_path, "rb") as f:
+        files = {"image": (os.path.basename(file_path), f, "image/png")}
+        # 추가: 선택된 태그 불러와서 서버에 함께 전달
+        mask_tags = current_selection().tags
+        data = {"mask_tags": ",".join(sorted(mask_tags))}
+
+        with instrumentation.span("gui.image_upload", bytes=os.path.getsize(file_path)) as info:
+            response = requests.post(server_url, files=files, data=data, timeout=UPLOAD_TIMEOUT)
+            if response.status_code != 200:
+                info["error"] = f"HTTP {response.status_code}"
+
+    if response.status_code != 200:
+        raise UploadError(f"❌ 서버 오류: {response.status_code}")
+
+    task.check_cancelled()
+    os.makedirs(save_folder, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    save_name = f"masked_{timestamp}_{os.path.basename(file_path)}"
+    save_path = os.path.join(save_folder, save_name)
+    with open(save_path, "wb") as out:
+        out.write(response.content)
+    return save_path
+
+def run_audio_masking(task, script_path, file_path, log_path="log.txt", result_path="masked_result.txt"):
+    # 워커 스레드에서 프로세스 종료를 기다리면서 log.txt 가 바뀔 때만 진행 상황으로 보냄
+    for path in (log_path, result_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    with instrumentation.span("gui.spawn_worker", script=os.path.basename(script_path)):
+        proc = subprocess.Popen(
+            ["pythonw", script_path, "--source", file_path],
+            stderr=subprocess.DEVNULL,
+            creationflags=CREATE_NO_WINDOW
+        )
+    print("🎤 audio_masking.py 실행됨")
+
+    log_size = 0
+    try:
+        while True:
+            finished = proc.poll() is not None
+            size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+            if size != log_size:
+                log_size = size
+                with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+                    task.progress(f.read().strip())
+            if finished:
+                break
+            task.sleep(0.5)
+    except BaseException:
+        proc.terminate()
+        raise
+
+    if not os.path.exists(result_path):
+        raise UploadError(f"❌ 음성 마스킹 실패 (종료 코드 {proc.returncode})")
+    with open(result_path, "r", encoding="utf-8") as f:
+        return f.read().strip()
 
 class FunctionWindow(QWidget):
     def __init__(self, back_callback=None):
@@ -62,16 +97,21 @@ class FunctionWindow(QWidget):
 
         self.text_proc = None
         self.img_proc = None
+        self.standby_proc = None
+        self.standby_script = None
+        self.metrics_window = None
+
+        self.tasks = default_service()
+        # 지금 묶음에서 아직 끝나지 않은 업로드 작업 id
+        self.image_pending = set()
+        self.voice_task = None
 
         self.reload_selected_fields()
         self.initUI()
+        QTimer.singleShot(0, self.prewarm_text_worker)
 
     def reload_selected_fields(self):
-        if os.path.exists("selected_fields.json"):
-            with open("selected_fields.json", "r", encoding="utf-8") as f:
-                self.mask_targets = json.load(f)
-        else:
-            self.mask_targets = []
+        self.mask_targets = list(current_selection().fields)
 
         print("불러온 마스킹 대상:", self.mask_targets)
 
@@ -145,9 +185,8 @@ class FunctionWindow(QWidget):
 
         self.stack = QStackedWidget()
         self.image_page = self.build_image_page()
-        self.voice_page = self.build_voice_page()
+        self.voice_page = None
         self.stack.addWidget(self.image_page)
-        self.stack.addWidget(self.voice_page)
 
         hbox_masking = QHBoxLayout()
         hbox_masking.setSpacing(10)
@@ -223,9 +262,15 @@ class FunctionWindow(QWidget):
             }
         """)
 
+        self.metrics_btn = QPushButton("성능 지표")
+        self.metrics_btn.setFixedSize(120, 47)
+        self.metrics_btn.clicked.connect(self.show_metrics)
+        self.metrics_btn.setStyleSheet(self.redo_btn.styleSheet())
+
         hbox_buttons = QHBoxLayout()
         hbox_buttons.setContentsMargins(0, 20, 0, 0)
         hbox_buttons.addWidget(self.redo_btn)
+        hbox_buttons.addWidget(self.metrics_btn)
         hbox_buttons.addStretch()
         hbox_buttons.addWidget(self.code_mode_btn)
         vbox.addLayout(hbox_buttons)
@@ -236,26 +281,79 @@ class FunctionWindow(QWidget):
         self.stack.setCurrentIndex(0)
         self.show()
 
+    def text_worker_script(self):
+        if self.code_mode_btn.isChecked():
+            return resource_path("masking/code_masking.pyw")
+        return resource_path("masking/text_masking.pyw")
+
+    def prewarm_text_worker(self):
+        # 텍스트 마스킹이 꺼져 있는 동안 현재 모드의 워커를 미리 띄워 모듈 로딩을 끝내 둠
+        if self.text_proc is not None:
+            return
+        script_path = self.text_worker_script()
+        if self.standby_proc and self.standby_proc.poll() is None and self.standby_script == script_path:
+            return
+        self.stop_standby_worker()
+        try:
+            self.standby_proc = subprocess.Popen(
+                ["pythonw", script_path, "--standby"],
+                stdin=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                creationflags=CREATE_NO_WINDOW
+            )
+            self.standby_script = script_path
+            print(f"🔥 대기 워커 준비: {os.path.basename(script_path)}")
+        except Exception as e:
+            self.standby_proc = None
+            print(f"❌ 대기 워커 실행 실패: {e}")
+
+    def stop_standby_worker(self):
+        if self.standby_proc:
+            self.standby_proc.terminate()
+        self.standby_proc = None
+        self.standby_script = None
+
+    def start_text_worker(self, script_path):
+        with instrumentation.span("gui.spawn_worker", script=os.path.basename(script_path)) as info:
+            proc = self.standby_proc
+            if proc and self.standby_script == script_path and proc.poll() is None:
+                try:
+                    proc.stdin.write(b"start\n")
+                    proc.stdin.flush()
+                    self.standby_proc = None
+                    self.standby_script = None
+                    self.text_proc = proc
+                    info["prewarmed"] = True
+                    return
+                except OSError:
+                    pass
+            self.stop_standby_worker()
+            self.text_proc = subprocess.Popen(
+                ["pythonw", script_path],
+                stderr=subprocess.DEVNULL,
+                creationflags=CREATE_NO_WINDOW
+            )
+            info["prewarmed"] = False
+
+    def stop_text_worker(self):
+        if self.text_proc:
+            self.text_proc.terminate()
+            self.text_proc = None
+        QTimer.singleShot(0, self.prewarm_text_worker)
+
     def toggle_text_masking_process(self):
         if self.btn_text.isChecked():
             if self.code_mode_btn.isChecked():
-                script_path = resource_path("masking/code_masking.pyw")
                 print("🚀 코드 모드: code_masking.py 실행")
             else:
-                script_path = resource_path("masking/text_masking.pyw")
                 print("🚀 일반 모드: text_masking.py 실행")
 
-            self.text_proc = subprocess.Popen(
-                ["pythonw", script_path],
-                stderr=subprocess.DEVNULL,
-                creationflags=CREATE_NO_WINDOW
-            )
+            self.start_text_worker(self.text_worker_script())
             self.btn_text.setText("텍스트 자동 마스킹 (ON)")
 
         else:
             if self.text_proc:
-                self.text_proc.terminate()
-                self.text_proc = None
+                self.stop_text_worker()
                 print("🛑 텍스트 마스킹 프로그램 종료됨")
             self.btn_text.setText("텍스트 자동 마스킹 (OFF)")
     
@@ -274,17 +372,13 @@ class FunctionWindow(QWidget):
                 print("🔄 텍스트 마스킹 프로세스 재시작 중...")
 
             if self.code_mode_btn.isChecked():
-                script_path = resource_path("masking/code_masking.pyw")
                 print("▶️ 코드 모드로 재실행: code_masking.py")
             else:
-                script_path = resource_path("masking/text_masking.pyw")
                 print("▶️ 일반 모드로 재실행: text_masking.py")
 
-            self.text_proc = subprocess.Popen(
-                ["pythonw", script_path],
-                stderr=subprocess.DEVNULL,
-                creationflags=CREATE_NO_WINDOW
-            )
+            self.start_text_worker(self.text_worker_script())
+        else:
+            self.prewarm_text_worker()
 
     def toggle_image_masking_process(self):
         if self.btn_image_masking.isChecked():
@@ -296,12 +390,13 @@ class FunctionWindow(QWidget):
                 env = os.environ.copy()
                 env["MASK_MODE"] = mode
 
-                self.img_proc = subprocess.Popen(
-                    ["pythonw", script_path],
-                    env=env,
-                    stderr=subprocess.DEVNULL,
-                    creationflags=CREATE_NO_WINDOW
-                )
+                with instrumentation.span("gui.spawn_worker", script=os.path.basename(script_path)):
+                    self.img_proc = subprocess.Popen(
+                        ["pythonw", script_path],
+                        env=env,
+                        stderr=subprocess.DEVNULL,
+                        creationflags=CREATE_NO_WINDOW
+                    )
                 print(f"🚀 이미지 마스킹 프로그램 실행됨 ({mode} 모드)")
                 self.btn_image_masking.setText("이미지 자동 마스킹 (ON)")
             else:
@@ -314,9 +409,15 @@ class FunctionWindow(QWidget):
                 print("🛑 이미지 마스킹 프로그램 종료됨")
             self.btn_image_masking.setText("이미지 자동 마스킹 (OFF)")
         
+    def show_metrics(self):
+        from metrics_window import MetricsWindow
+        if self.metrics_window is None:
+            self.metrics_window = MetricsWindow()
+        self.metrics_window.show()
+        self.metrics_window.raise_()
+
     def handle_back_to_selection(self):
-        if os.path.exists("selected_fields.json"):
-            os.remove("selected_fields.json")
+        clear_selection()
         if self.back_callback:
             self.back_callback()
 
@@ -345,8 +446,14 @@ class FunctionWindow(QWidget):
         self.copy_btn.clicked.connect(self.copy_preview_image_to_clipboard)
         self.copy_btn.hide()
 
+        self.image_cancel_btn = QPushButton("업로드 취소")
+        self.image_cancel_btn.setFixedWidth(200)
+        self.image_cancel_btn.clicked.connect(self.cancel_image_uploads)
+        self.image_cancel_btn.hide()
+
         layout.addWidget(label, alignment=Qt.AlignCenter)
         layout.addWidget(self.image_upload_btn, alignment=Qt.AlignCenter)
+        layout.addWidget(self.image_cancel_btn, alignment=Qt.AlignCenter)
         layout.addWidget(self.img_file_label, alignment=Qt.AlignCenter)
         layout.addWidget(self.img_preview, alignment=Qt.AlignCenter)
         layout.addWidget(self.copy_btn, alignment=Qt.AlignCenter)
@@ -421,6 +528,9 @@ class FunctionWindow(QWidget):
         return widget
 
     def reset_voice_page(self):
+        if self.voice_task:
+            self.voice_task.cancel()
+            self.voice_task = None
         self.voice_file_label.setText("선택된 파일 없음")
         self.scroll_label.setText("")
         self.scroll_area.hide()
@@ -441,40 +551,70 @@ class FunctionWindow(QWidget):
             QMessageBox.critical(self, "에러", "❌ {env_key}  환경 변수가 설정되지 않았습니다.")
             return
 
-        file_path, _ = QFileDialog.getOpenFileName(
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self, "이미지 선택", "", "Images (*.png *.jpg *.jpeg *.bmp)"
         )
 
-        if not file_path:
+        if not file_paths:
             self.img_file_label.setText("선택된 파일 없음")
             self.img_preview.clear()
             self.img_preview.hide()
             self.copy_btn.hide()
             return
 
-        self.img_file_label.setText(f"선택된 이미지: {os.path.basename(file_path)}")
+        names = ", ".join(os.path.basename(path) for path in file_paths)
+        self.img_file_label.setText(f"선택된 이미지: {names}")
         self.img_preview.clear()
         self.img_preview.setText("⏳ 마스킹 처리 중...")
         self.img_preview.show()
         self.copy_btn.hide()
 
         self.image_upload_btn.hide()
-
-        self.upload_worker = ImageUploadWorker(server_url, file_path, "masked_images")
-        self.upload_worker.finished.connect(self.display_masked_image)
-        self.upload_worker.error.connect(self.display_error)
-        self.upload_worker.start()
-
-
-    def display_masked_image(self, save_path):
+        self.image_cancel_btn.show()
+
+        # 여러 장을 골라도 공용 작업 풀에서 동시에 올림 (동시 업로드 수는 task_service 에서 제한)
+        # 취소된 이전 묶음의 작업이 늦게 끝나도 새 묶음 상태를 건드리지 않도록 id 로 따로 셈
+        self.image_pending = {self.submit_image_upload(server_url, path).id for path in file_paths}
+
+    def submit_image_upload(self, server_url, file_path):
+        # 콜백은 UI 스레드에서 submit 이 돌아온 뒤에 불리므로 task 를 그대로 씀
+        task = self.tasks.submit(
+            upload_image_file, server_url, file_path, "masked_images",
+            group="upload",
+            on_done=lambda save_path: self.display_masked_image(task.id, save_path),
+            on_error=lambda error: self.display_error(task.id, error),
+            on_cancel=lambda: self.finish_image_upload(task.id)
+        )
+        return task
+
+    def cancel_image_uploads(self):
+        self.tasks.cancel_group("upload")
+        self.img_preview.setText("🛑 업로드 취소됨")
+        print("🛑 이미지 업로드 취소")
+
+    def finish_image_upload(self, task_id):
+        if task_id not in self.image_pending:
+            return False
+        self.image_pending.discard(task_id)
+        if not self.image_pending:
+            self.image_cancel_btn.hide()
+            self.image_upload_btn.show()
+        return True
+
+    def display_masked_image(self, task_id, save_path):
+        if not self.finish_image_upload(task_id):
+            return
         pixmap = QPixmap(save_path).scaled(600, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation)
         self.img_preview.setPixmap(pixmap)
         self.copy_btn.show()
-        self.image_upload_btn.show()
 
-    def display_error(self, error_message):
-        self.img_preview.setText(error_message)
-        self.image_upload_btn.show()
+    def display_error(self, task_id, error):
+        if not self.finish_image_upload(task_id):
+            return
+        if isinstance(error, UploadError):
+            self.img_preview.setText(str(error))
+        else:
+            self.img_preview.setText(f"❌ 요청 실패: {error}")
     
     def copy_preview_image_to_clipboard(self):
         if not self.img_preview.pixmap():
@@ -485,56 +625,40 @@ class FunctionWindow(QWidget):
 
     def upload_voice(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "음성 선택", "", "Audio Files (*.mp3 *.wav *.m4a)")
-        if os.path.exists("log.txt"):
-            os.remove("log.txt")
-
-        self.log_timer = QTimer(self)
-        self.log_timer.timeout.connect(self.update_log_display)
-        self.log_timer.start(1000)
-        if file_path:
-            self.voice_file_label.setText(f"선택된 음성: {file_path.split('/')[-1]}")
-            self.sender().hide()
-            self.voice_file_label.hide()
-            self.scroll_label.setText("⏳ 마스킹 처리 중...")
-            self.scroll_area.show()
-
-            result_path = "masked_result.txt"
-            if os.path.exists(result_path):
-                os.remove(result_path)
-
-            script_path = resource_path("masking/audio_masking.pyw")
-            try:
-                subprocess.Popen(
-                    ["pythonw", script_path, "--source", file_path],
-                    stderr=subprocess.DEVNULL,
-                    creationflags=CREATE_NO_WINDOW
-                )
-                print("🎤 audio_masking.py 실행됨")
+        if not file_path:
+            return
 
-                self.check_result_timer = QTimer(self)
-                self.check_result_timer.timeout.connect(self.check_masking_result)
-                self.check_result_timer.start(2000)
+        self.voice_file_label.setText(f"선택된 음성: {file_path.split('/')[-1]}")
+        self.upload_btn.hide()
+        self.voice_file_label.hide()
+        self.scroll_label.setText("⏳ 마스킹 처리 중...")
+        self.scroll_area.show()
+
+        # 프로세스 대기와 log.txt / masked_result.txt 읽기는 작업 풀에서 하고 UI 는 콜백으로만 갱신
+        script_path = resource_path("masking/audio_masking.pyw")
+        self.voice_task = self.tasks.submit(
+            run_audio_masking, script_path, file_path,
+            group="audio",
+            on_done=self.show_masking_result,
+            on_error=self.show_voice_error,
+            on_progress=self.update_log_display
+        )
 
-            except Exception as e:
-                print(f"❌ audio_masking.py 실행 실패: {e}")
-
-    def update_log_display(self):
-        if os.path.exists("log.txt"):
-            with open("log.txt", "r", encoding="utf-8") as f:
-                lines = f.read().strip()
-            self.scroll_label.setText(lines)
-
-    def check_masking_result(self):
-        result_path = "masked_result.txt"
-        if os.path.exists(result_path):
-            with open(result_path, "r", encoding="utf-8") as f:
-                result_text = f.read().strip()
-            self.final_masked_result = result_text
-            self.scroll_label.setText(f"🛡️ 마스킹 결과:\n{result_text}")
-            self.copy_result_btn.show()
-            self.reupload_btn.show()
-            self.check_result_timer.stop()
-            self.log_timer.stop()
+    def update_log_display(self, lines):
+        self.scroll_label.setText(lines)
+
+    def show_masking_result(self, result_text):
+        self.voice_task = None
+        self.final_masked_result = result_text
+        self.scroll_label.setText(f"🛡️ 마스킹 결과:\n{result_text}")
+        self.copy_result_btn.show()
+        self.reupload_btn.show()
+
+    def show_voice_error(self, error):
+        self.voice_task = None
+        print(f"❌ audio_masking.py 실행 실패: {error}")
+        self.scroll_label.setText(str(error) if isinstance(error, UploadError) else f"❌ 음성 마스킹 실패: {error}")
+        self.reupload_btn.show()
 
     def copy_masked_result(self):
         clipboard = QApplication.clipboard()
@@ -551,6 +675,9 @@ class FunctionWindow(QWidget):
         self.update_button_style()
 
     def select_voice(self):
+        if self.voice_page is None:
+            self.voice_page = self.build_voice_page()
+            self.stack.addWidget(self.voice_page)
         self.btn_voice.setChecked(True)
         self.btn_image.setChecked(False)
         self.stack.setCurrentIndex(1)
@@ -560,6 +687,9 @@ class FunctionWindow(QWidget):
         if self.text_proc:
             self.text_proc.terminate()
             print("🛑 텍스트 마스킹 프로세스도 함께 종료됨")
+        self.stop_standby_worker()
+        self.tasks.cancel_group("upload")
+        self.tasks.cancel_group("audio")
 
         log_path = "log.txt"
         if os.path.exists(log_path):
@@ -614,6 +744,7 @@ class FunctionWindow(QWidget):
 
 
 if __name__ == '__main__':
+    instrumentation.configure("gui")
     app = QApplication(sys.argv)
     
     font_id = QFontDatabase.addApplicationFont(resource_path("public/Pretendard-Regular.otf"))
@@ -6,6 +6,9 @@ from PyQt5.QtGui import QFontDatabase, QFont, QIcon
 from intro_window import IntroWindow
 from function_window import FunctionWindow
 from select_window import SelectionWindow
+from masking import instrumentation
+from masking.selection_config import has_selection, clear_selection
+from masking.task_service import default_service
 
 def resource_path(relative_path):
     base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
@@ -15,38 +18,50 @@ class MainWindow(QStackedWidget):
     def __init__(self):
         super().__init__()
 
+        # 선택/기능 화면은 처음 필요할 때 만듦
         self.intro = IntroWindow(self.route_from_intro)
-        self.selection = SelectionWindow(self.show_function_screen)
-        self.function = FunctionWindow(self.back_to_selection)
+        self.selection = None
+        self.function = None
 
         self.addWidget(self.intro)
-        self.addWidget(self.selection)
-        self.addWidget(self.function)
 
         self.setWindowTitle("Erase Me")
         self.setWindowIcon(QIcon(resource_path('public/icon.png')))
         self.resize(1000, 700)
 
-        self.setCurrentIndex(0)
+        self.setCurrentWidget(self.intro)
         self.show()
 
+    def selection_screen(self):
+        if self.selection is None:
+            self.selection = SelectionWindow(self.show_function_screen)
+            self.addWidget(self.selection)
+        return self.selection
+
+    def function_screen(self):
+        if self.function is None:
+            self.function = FunctionWindow(self.back_to_selection)
+            self.addWidget(self.function)
+        return self.function
+
     def route_from_intro(self):
-        if os.path.exists("selected_fields.json"):
+        if has_selection():
             self.show_function_screen()
         else:
-            self.setCurrentIndex(1)
+            self.setCurrentWidget(self.selection_screen())
 
     def show_function_screen(self):
-        self.function.reload_selected_fields()
-        self.setCurrentIndex(2)
+        function = self.function_screen()
+        function.reload_selected_fields()
+        self.setCurrentWidget(function)
 
     def back_to_selection(self):
-        if os.path.exists("selected_fields.json"):
-            os.remove("selected_fields.json")
-        self.setCurrentIndex(1)
+        clear_selection()
+        self.setCurrentWidget(self.selection_screen())
 
 
 if __name__ == '__main__':
+    instrumentation.configure("gui")
     app = QApplication(sys.argv)
 
     font_path = resource_path("public/Pretendard-Regular.otf")
@@ -84,6 +99,9 @@ if __name__ == '__main__':
 
     clean_masking_record()
     app.aboutToQuit.connect(cleanup_masking_record)
+    # 기능 화면은 스택 안의 페이지라 closeEvent 가 오지 않으므로, 종료할 때 진행 중인 작업을 여기서 취소함
+    # (음성 마스킹은 task.sleep 에서 깨어나 프로세스를 종료함)
+    app.aboutToQuit.connect(default_service().shutdown)
 
     win = MainWindow()
     sys.exit(app.exec_())
\ No newline at end of file
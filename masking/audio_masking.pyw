@@ -4,11 +4,11 @@ import re
 import sys
 import uuid
 import json
-from pydub import AudioSegment
-from google.cloud import speech
-import requests
 import argparse
 from dotenv import load_dotenv
+import instrumentation
+from selection_config import current_selection
+from ner_client import get_client
 
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
@@ -19,33 +19,39 @@ def resource_path(relative_path):
 
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = resource_path("capstone2-461808-885e4052d835.json")
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--source", required=True, help="Path to source audio file (wav)")
-args = parser.parse_args()
-SOURCE_FILE = args.source
 CHUNK_LENGTH_MS = 30 * 1000
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", required=True, help="Path to source audio file (wav)")
+    return parser.parse_args(argv)
+
 load_dotenv(dotenv_path=resource_path(".env"))
 server_url = os.getenv("TEXT_MASKING_SERVER_URL")
 MASK_CACHE_FILE = "masking_record_text.json"
 
-SELECTION_MASKING = {
-    "이름": {"PERSON"},
-    "날짜": {"DATE"},
-    "시간": {"TIME"},
-    "장소": {"LOCATION"},
-    "기관": {"ORGANIZATION"},
-    "이메일": {"EMAIL"},
-    "전화번호": {"PHONE"},
-    "주민등록번호": {"SSN"}
-}
 MASK_CACHE = {}
 
+# google.cloud.speech 는 불러오는 데 오래 걸려서 첫 변환 직전에 불러오고, 클라이언트는 조각끼리 재사용함
+speech = None
+_speech_client = None
+
+def get_speech_client():
+    global speech, _speech_client
+    if speech is None:
+        from google.cloud import speech as cloud_speech
+        speech = cloud_speech
+    if _speech_client is None:
+        _speech_client = speech.SpeechClient()
+    return _speech_client
+
 def save_mask_cache():
-    with open(MASK_CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(MASK_CACHE, f, ensure_ascii=False, indent=2)
+    with instrumentation.span("mask_store.save", entries=len(MASK_CACHE)):
+        with open(MASK_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(MASK_CACHE, f, ensure_ascii=False, indent=2)
 
 def split_audio(file_path, chunk_length_ms):
+    from pydub import AudioSegment
     audio = AudioSegment.from_wav(file_path)
     chunks = []
     for i in range(0, len(audio), chunk_length_ms):
@@ -56,7 +62,7 @@ def split_audio(file_path, chunk_length_ms):
     return chunks
 
 def transcribe_chunk(path):
-    client = speech.SpeechClient()
+    client = get_speech_client()
     with io.open(path, 'rb') as audio_file:
         content = audio_file.read()
 
@@ -78,34 +84,21 @@ def transcribe_chunk(path):
 def generate_uid():
     return str(uuid.uuid4())[:8]
 
-def load_mask_tags_from_selection(file="selected_fields.json"):
-    if not os.path.exists(file):
-        return set()
-    with open(file, "r", encoding="utf-8") as f:
-        selections = json.load(f)
-    tags = set()
-    for sel in selections:
-        tags.update(SELECTION_MASKING.get(sel, set()))
-    return tags
-
 def get_ner_result(text):
-    try:
-        response = requests.post(server_url, json={"text": text}, timeout=60)
-        response.raise_for_status()
-        return response.json()["ner_result"]
-    except Exception as e:
-        print(f"❌ 서버 요청 실패: {e}")
-        return []
+    return get_client(server_url).get_ner_result(text)
 
-def mask_text_with_cache(text):
-    mask_tags = load_mask_tags_from_selection()
-    result = get_ner_result(text)
+def mask_text_with_cache(text, result=None):
+    # result: 조각별로 미리 받아 둔 NER 결과 (없으면 전체 텍스트로 요청)
+    mask_tags = current_selection().tags
+    if result is None:
+        result = get_ner_result(text)
     masked_text = text
 
     global MASK_CACHE
     if os.path.exists(MASK_CACHE_FILE):
-        with open(MASK_CACHE_FILE, "r", encoding="utf-8") as f:
-            MASK_CACHE = json.load(f)
+        with instrumentation.span("mask_store.load"):
+            with open(MASK_CACHE_FILE, "r", encoding="utf-8") as f:
+                MASK_CACHE = json.load(f)
 
     def add_to_cache_and_replace(tag, word):
         uid = generate_uid()
@@ -137,19 +130,28 @@ def append_log(message):
         f.write(message + "\n")
 
 def main():
+    source_file = parse_args().source
     print("🔪 오디오 분할 중...")
-    print("SOURCE_FILE 경로:", SOURCE_FILE)
-    print("파일 존재 여부:", os.path.exists(SOURCE_FILE))
-    chunk_paths = split_audio(SOURCE_FILE, CHUNK_LENGTH_MS)
+    print("SOURCE_FILE 경로:", source_file)
+    print("파일 존재 여부:", os.path.exists(source_file))
+    with instrumentation.span("audio.split") as info:
+        chunk_paths = split_audio(source_file, CHUNK_LENGTH_MS)
+        info["chunks"] = len(chunk_paths)
 
     append_log("🗣️ 음성 인식 시작...\n")
     full_transcript = ""
+    # 조각 텍스트는 나오는 대로 NER 에 넘겨서, 다음 조각 인식과 겹쳐 처리하고 여러 조각을 한 요청으로 묶음
+    ner_client = get_client(server_url)
+    ner_futures = []
     for i, chunk_path in enumerate(chunk_paths):
         append_log(f"🎧 조각 {i+1}/{len(chunk_paths)} 처리 중...")
         try:
-            transcript = transcribe_chunk(chunk_path)
+            with instrumentation.span("stt.chunk", index=i):
+                transcript = transcribe_chunk(chunk_path)
             append_log(f"📄 조각 {i+1} 텍스트: {transcript}\n")
             full_transcript += transcript + " "
+            if transcript.strip():
+                ner_futures.append(ner_client.submit(transcript))
         except Exception as e:
             append_log(f"❌ 조각 {i+1}에서 오류 발생: {e}")
         os.remove(chunk_path)
@@ -159,7 +161,9 @@ def main():
 
     print("🛡️ 마스킹 중...")
     try:
-        masked_sentence = mask_text_with_cache(full_transcript)
+        with instrumentation.span("audio.mask", chars=len(full_transcript)):
+            ner_result = [entity for future in ner_futures for entity in future.result()]
+            masked_sentence = mask_text_with_cache(full_transcript, ner_result)
         append_log("✅ 마스킹 완료")
         append_log(masked_sentence)
         print("✅ 마스킹 완료\n")
@@ -2,11 +2,11 @@ import os
 import json
 import re
 import sys
-import pyperclip
 import uuid
 import time
 import atexit
-import psutil
+import instrumentation
+from structured_masking import mask_structured
 
 masking_map = {}
 _terminal_cache = {}
@@ -17,6 +17,7 @@ LOCK_FILE = "code_masking.lock"
 def is_already_running():
     if not os.path.exists(LOCK_FILE):
         return False
+    import psutil
     try:
         with open(LOCK_FILE, "r") as f:
             pid = int(f.read())
@@ -36,14 +37,17 @@ def remove_lock():
         os.remove(LOCK_FILE)
 
 def save_mask_cache():
-    with open(MASK_CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(masking_map, f, ensure_ascii=False, indent=2)
+    with instrumentation.span("mask_store.save", entries=len(masking_map)):
+        with open(MASK_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(masking_map, f, ensure_ascii=False, indent=2)
 
 def load_mask_cache():
     global masking_map
     if os.path.exists(MASK_CACHE_FILE):
-        with open(MASK_CACHE_FILE, "r", encoding="utf-8") as f:
-            masking_map = json.load(f)
+        with instrumentation.span("mask_store.load") as info:
+            with open(MASK_CACHE_FILE, "r", encoding="utf-8") as f:
+                masking_map = json.load(f)
+            info["entries"] = len(masking_map)
 
 def generate_placeholder(label):
     return f"{label.upper()}_{uuid.uuid4().hex[:8]}"
@@ -77,8 +81,13 @@ def is_sensitive_value(value: str):
         return "key"
     return None
 
+URL_PATTERN = re.compile(r'((?:\w+\.)*\w+)\s*=\s*["\'](https?://[^\s"\']+)["\']')
+KEY_PATTERN = re.compile(r'((?:\w+\.)*\w*(KEY|TOKEN|SECRET)\w*)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+DEFINE_PATTERN = re.compile(r'#define\s+(\w*(key|token|secret|url)\w*)\s+["\']([^"\']+)["\']', re.IGNORECASE)
+ENV_PATTERN = re.compile(r'(["\']?\w*(KEY|TOKEN|SECRET|URL)\w*["\']?)\s*[:=]\s*["\'](https?://[^\s"\']+|[^"\']{8,})["\']', re.IGNORECASE)
+
 def extract_url(text: str):
-    pattern = r'((?:\w+\.)*\w+)\s*=\s*["\'](https?://[^\s"\']+)["\']'
+    pattern = URL_PATTERN
     def replacer(match):
         key, value = match.group(1), match.group(2)
         label = is_sensitive_value(value)
@@ -89,7 +98,7 @@ def extract_url(text: str):
     return re.sub(pattern, replacer, text)
 
 def extract_keys(text: str):
-    pattern = re.compile(r'((?:\w+\.)*\w*(KEY|TOKEN|SECRET)\w*)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+    pattern = KEY_PATTERN
     def replacer(match):
         keys, value = match.group(1), match.group(3)
         label = is_sensitive_value(value)
@@ -110,7 +119,7 @@ def extract_email(text: str):
     return pattern.sub(replacer, text)
 
 def extract_define_Clang(text: str):
-    pattern = re.compile(r'#define\s+(\w*(key|token|secret|url)\w*)\s+["\']([^"\']+)["\']', re.IGNORECASE)
+    pattern = DEFINE_PATTERN
     def replacer(match):
         key, value = match.group(1), match.group(3)
         label = is_sensitive_value(value)
@@ -121,7 +130,7 @@ def extract_define_Clang(text: str):
     return re.sub(pattern, replacer, text)
 
 def extract_env_style(text: str):
-    pattern = re.compile(r'(["\']?\w*(KEY|TOKEN|SECRET|URL)\w*["\']?)\s*[:=]\s*["\'](https?://[^\s"\']+|[^"\']{8,})["\']', re.IGNORECASE)
+    pattern = ENV_PATTERN
     def replacer(match):
         key, value = match.group(1), match.group(3)
         label = is_sensitive_value(value)
@@ -131,6 +140,50 @@ def extract_env_style(text: str):
         return match.group(0)
     return re.sub(pattern, replacer, text)
 
+# JSON/CSV/키=값 설정 파일은 필드 이름으로 가릴 값을 고르고, 나머지 값과 줄에서는 이메일/URL 과
+# extract_* 가 찾는 형태(access_key = "..." 등)를 찾음
+# 필드 이름은 식별자 하나여야 하고, _ . - 와 camelCase 로 나눈 단어 단위로 비교함 (send_mail( / monkey 는 아님)
+CODE_FIELD_LABELS = {}
+for _words, _label in [
+    (["key", "apikey", "token", "secret", "password", "passwd", "pwd", "credential", "credentials"], "key"),
+    (["url", "uri", "endpoint", "dsn"], "url"),
+    (["email", "mail"], "email"),
+]:
+    for _word in _words:
+        CODE_FIELD_LABELS[_word] = _label
+CODE_FIELD_NAME = re.compile(r'[A-Za-z_][\w.\-]*')
+CODE_FIELD_WORD = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+CODE_VALUE_PATTERN = re.compile(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+|https?://[^\s"\']+')
+
+def code_field_label(name):
+    if not CODE_FIELD_NAME.fullmatch(name):
+        return None
+    for word in CODE_FIELD_WORD.findall(name):
+        label = CODE_FIELD_LABELS.get(word.lower())
+        if label:
+            return label
+    return None
+
+def find_code_values(text):
+    found = [(m.group(0), "url" if m.group(0).startswith("http") else "email")
+             for m in CODE_VALUE_PATTERN.finditer(text)]
+    for pattern, group in ((URL_PATTERN, 2), (KEY_PATTERN, 3), (DEFINE_PATTERN, 3), (ENV_PATTERN, 3)):
+        for m in pattern.finditer(text):
+            label = is_sensitive_value(m.group(group))
+            if label:
+                found.append((m.group(group), label))
+    return found
+
+def mask_code_value(label, value):
+    if is_already_masked(value) or not is_sensitive_value(value):
+        return value
+    return mask_and_store(label, value)
+
+def mask_structured_code(text):
+    structured = mask_structured(text, {"key", "url", "email"}, find_code_values, mask_code_value,
+                                 field_tag=code_field_label, mask_free=multi_mask)
+    return structured[0] if structured else None
+
 def mask_terminal(code) :
     lines = code.splitlines()
     masked_lines = []
@@ -173,7 +226,8 @@ def mask_terminal(code) :
             masked_user = mask_and_store("user", user)
             masked_path = mask_and_store("path", path.replace("\\", "/"))
             print("User's WindowOS")
-            masked_line = f"{drive}:\\Users\\{masked_user}\\{masked_path.replace('\\', '/')}>"
+            masked_path = masked_path.replace('\\', '/')
+            masked_line = f"{drive}:\\Users\\{masked_user}\\{masked_path}>"
             _terminal_cache[line] = masked_line
             masked_lines.append(masked_line)
             continue
@@ -235,22 +289,27 @@ def mask_path_full(path):
         return f"/{prefix}/{user_mask}"
     
 def main():
+    import pyperclip
     print("📋 code_masking 클립보드 감시 시작...")
     last_clip = pyperclip.paste()
 
     try:
         while True:
+            read_start = time.perf_counter()
             current_clip = pyperclip.paste()
+            read_ms = (time.perf_counter() - read_start) * 1000
 
             if current_clip.strip() == "":
                 time.sleep(0.3)
                 continue
 
             if current_clip != last_clip:
+                instrumentation.record_span("clipboard.read", read_ms, chars=len(current_clip))
                 if has_masked_placeholder(current_clip):
                     print("\n♻️ 마스킹된 텍스트 감지 → 역마스킹")
-                    load_mask_cache()
-                    restored = unmask(current_clip)
+                    with instrumentation.span("code.unmask", chars=len(current_clip)):
+                        load_mask_cache()
+                        restored = unmask(current_clip)
                     pyperclip.copy(restored)
                     print("✅ 복원 후 클립보드에 저장됨:\n", restored)
                     last_clip = restored
@@ -258,8 +317,14 @@ def main():
 
                 print("\n🔍 새 복사 감지!\n", current_clip)
 
-                terminal_masked = mask_terminal(current_clip)
-                fully_masked = multi_mask(terminal_masked)
+                with instrumentation.span("code.mask", chars=len(current_clip)):
+                    with instrumentation.span("code.mask_terminal"):
+                        terminal_masked = mask_terminal(current_clip)
+                    with instrumentation.span("code.structured"):
+                        fully_masked = mask_structured_code(terminal_masked)
+                    if fully_masked is None:
+                        with instrumentation.span("code.multi_mask"):
+                            fully_masked = multi_mask(terminal_masked)
 
                 if fully_masked != current_clip:
                     print("✅ 마스킹 적용됨 → 클립보드에 저장:\n", fully_masked)
@@ -273,9 +338,18 @@ def main():
 
     except Exception as e:
         print(f"❌ 예외 발생: {e}")
+        instrumentation.record("error", "code_masking.main", error=str(e))
         input("Press Enter to exit...")
 
+def wait_for_start():
+    # GUI 가 미리 띄워 둔 대기 프로세스: 무거운 모듈만 불러 두고 시작 신호(표준 입력 한 줄)를 기다림
+    import pyperclip, psutil
+    if sys.stdin is None or not sys.stdin.readline():
+        sys.exit()
+
 if __name__ == "__main__":
+    if "--standby" in sys.argv:
+        wait_for_start()
     if is_already_running():
         sys.exit()
     create_lock()
@@ -1,20 +1,24 @@
+import io
 import os
 import sys
 import time
 import datetime
-import requests
-from PIL import Image
 from dotenv import load_dotenv
-from text_masking import load_mask_tags_from_selection
+from selection_config import current_selection, subscribe
+from tile_diff import TileDiffCache, encode_png
+from task_service import TaskService
+import instrumentation
 import json
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QTabWidget, QMessageBox
 )
 from PyQt5.QtGui import QPixmap, QFontDatabase, QFont
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer
 
 interrupt_delay = 5000
+# 연속 스크린샷에서 바뀐 타일 영역만 OCR 서버로 보냄 (IMG_TILE_DIFF=0 이면 항상 전체 전송)
+TILE_DIFF_ENABLED = os.getenv("IMG_TILE_DIFF", "1") != "0"
 
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
@@ -23,34 +27,102 @@ def resource_path(relative_path):
         base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     return os.path.join(base_path, relative_path)
 
-class MaskingWorker(QThread):
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-
-    def __init__(self, server_url, img_data, save_path):
-        super().__init__()
+class MaskingError(Exception):
+    pass
+
+def qimage_to_bytes(qimage):
+    from PyQt5.QtCore import QBuffer
+    buffer = QBuffer()
+    buffer.open(QBuffer.ReadWrite)
+    qimage.save(buffer, "PNG")
+    return buffer.data()
+
+def mask_clipboard_image(task, server_url, qimage, save_path, tile_cache=None):
+    # PNG 인코딩부터 저장까지 작업 풀 스레드에서 처리함 (QImage 는 GUI 스레드 밖에서도 쓸 수 있음)
+    with instrumentation.span("image.encode", width=qimage.width(), height=qimage.height()):
+        img_data = qimage_to_bytes(qimage)
+    task.check_cancelled()
+    return MaskingWorker(server_url, img_data, save_path, tile_cache).run()
+
+class MaskingWorker:
+    def __init__(self, server_url, img_data, save_path, tile_cache=None):
         self.server_url = server_url
         self.img_data = img_data
         self.save_path = save_path
+        self.tile_cache = tile_cache
+
+    def request_masking(self, img_bytes, data):
+        import requests
+        files = {"image": ("clipboard.png", img_bytes, "image/png")}
+        print(f"[디버그] 요청 URL: {self.server_url}")
+        print(f"[디버그] 요청 태그: {data}")
+        print(f"[디버그] 전송 크기: {len(img_bytes)} bytes")
+        with instrumentation.span("image.upload", bytes=len(img_bytes)) as info:
+            res = requests.post(self.server_url, files=files, data=data)
+            if res.status_code != 200:
+                info["error"] = f"HTTP {res.status_code}"
+        instrumentation.count("image.upload_bytes", len(img_bytes))
+        print(f"[디버그] 응답 상태코드: {res.status_code}")
+        print(f"[디버그] 응답 내용: {res.text[:200]}...")
+        return res
 
     def run(self):
-        try:
-            files = {"image": ("clipboard.png", self.img_data, "image/png")}
-            mask_tags = list(load_mask_tags_from_selection())
-            data = {"mask_tags": ",".join(mask_tags)}
-            print(f"[디버그] 요청 URL: {self.server_url}")
-            print(f"[디버그] 요청 태그: {data}")
-            res = requests.post(self.server_url, files=files, data=data)
-            print(f"[디버그] 응답 상태코드: {res.status_code}")
-            print(f"[디버그] 응답 내용: {res.text[:200]}...")
-            if res.status_code == 200:
+        # 요청 하나는 처음 읽은 선택 스냅샷으로 끝까지 처리함
+        selection = current_selection()
+        with instrumentation.span("image.mask", selection_version=selection.version) as info:
+            message = self.mask_image(selection)
+            if message:
+                info["error"] = message
+        if message:
+            raise MaskingError(message)
+        return self.save_path
+
+    def mask_image(self, selection=None):
+        from PIL import Image
+        selection = selection or current_selection()
+        mask_tags = selection.tags
+        data = {"mask_tags": ",".join(sorted(mask_tags))}
+
+        if self.tile_cache is None:
+            res = self.request_masking(bytes(self.img_data), data)
+            if res.status_code != 200:
+                return f"❌ 서버 오류: {res.status_code}"
+            with instrumentation.span("image.save"):
                 with open(self.save_path, "wb") as out:
                     out.write(res.content)
-                self.finished.emit(self.save_path)
+            return None
+
+        with instrumentation.span("image.tile_plan") as info:
+            image = Image.open(io.BytesIO(bytes(self.img_data)))
+            image.load()
+            plan = self.tile_cache.plan(image, mask_tags)
+            info["plan"] = plan.kind
+        print(f"[디버그] 타일 비교 결과: {plan.kind} {plan.box or ''}")
+
+        masked = None
+        if plan.kind != "reuse":
+            if plan.kind == "full":
+                upload = bytes(self.img_data)
             else:
-                self.error.emit(f"❌ 서버 오류: {res.status_code}")
-        except Exception as e:
-            self.error.emit(f"❌ 요청 실패: {e}")
+                with instrumentation.span("image.encode", region=True):
+                    upload = encode_png(image.crop(plan.box))
+            res = self.request_masking(upload, data)
+            if res.status_code != 200:
+                return f"❌ 서버 오류: {res.status_code}"
+            masked = Image.open(io.BytesIO(res.content))
+            masked.load()
+
+        with instrumentation.span("image.compose", plan=plan.kind):
+            result = self.tile_cache.compose(plan, masked)
+            self.tile_cache.remember(plan, result)
+        with instrumentation.span("image.save"):
+            if plan.kind == "full":
+                # 서버가 돌려준 PNG 를 그대로 저장 (다시 인코딩하지 않음)
+                with open(self.save_path, "wb") as out:
+                    out.write(res.content)
+            else:
+                result.save(self.save_path, "PNG")
+        return None
 
 class ImageMaskingApp(QWidget):
     def __init__(self):
@@ -104,6 +176,12 @@ class ImageMaskingApp(QWidget):
         self.last_clip = clipboard.pixmap()
         self.is_processing = False
         self.is_internal_copy = False
+        self.tile_cache = TileDiffCache() if TILE_DIFF_ENABLED else None
+        if self.tile_cache is not None:
+            # 마스킹 대상이 바뀌면 이전 태그로 가린 결과는 다시 쓸 일이 없으므로 비움
+            subscribe(lambda selection: self.tile_cache.clear())
+        # 타일 캐시가 직전 결과를 이어 쓰므로 클립보드 이미지는 한 번에 하나씩 처리함
+        self.tasks = TaskService(max_workers=1, limits={"image": 1})
 
         self.timer = QTimer()
         self.timer.timeout.connect(self.monitor_clipboard)
@@ -118,11 +196,7 @@ class ImageMaskingApp(QWidget):
         if img and not img.isNull() and (self.last_clip is None or img.toImage() != self.last_clip.toImage()):
             self.last_clip = img
 
-            buffer = img.toImage().bits().asstring(img.width() * img.height() * 4)
             qimage = img.toImage()
-            byte_array = qimage.bits().asstring(qimage.byteCount())
-            image = Image.frombytes("RGBA", (qimage.width(), qimage.height()), byte_array)
-            img_data = self.qimage_to_bytes(qimage)
 
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             os.makedirs("masked_images", exist_ok=True)
@@ -141,21 +215,12 @@ class ImageMaskingApp(QWidget):
             self.copy_button.setEnabled(False)
 
             self.is_processing = True
-            self.worker = MaskingWorker(
-                self.server_url,
-                img_data,
-                save_path
+            self.tasks.submit(
+                mask_clipboard_image, self.server_url, qimage, save_path, self.tile_cache,
+                group="image",
+                on_done=self.update_masked_image,
+                on_error=self.show_error
             )
-            self.worker.finished.connect(self.update_masked_image)
-            self.worker.error.connect(self.show_error)
-            self.worker.start()
-
-    def qimage_to_bytes(self, qimage):
-        from PyQt5.QtCore import QBuffer, QByteArray
-        buffer = QBuffer()
-        buffer.open(QBuffer.ReadWrite)
-        qimage.save(buffer, "PNG")
-        return buffer.data()
 
     def update_masked_image(self, path):
         pixmap = QPixmap(path)
@@ -178,7 +243,8 @@ class ImageMaskingApp(QWidget):
     def reset_internal_copy(self):
         self.is_internal_copy = False
 
-    def show_error(self, message):
+    def show_error(self, error):
+        message = str(error) if isinstance(error, MaskingError) else f"❌ 요청 실패: {error}"
         QMessageBox.critical(self, "에러", message)
         self.masked_image_label.setText("❌ 서버 요청 실패")
         self.copy_button.setEnabled(False)
@@ -201,4 +267,6 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = ImageMaskingApp()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    code = app.exec_()
+    window.tasks.shutdown()
+    sys.exit(code)
\ No newline at end of file
@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import glob
+import math
+import time
+import logging
+import threading
+import collections
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+METRICS_DIR = os.getenv("ERASEME_METRICS_DIR", "metrics")
+MAX_BYTES = 1024 * 1024
+BACKUP_COUNT = 3
+
+# 현장에서 느린 붙여넣기를 진단할 때만 켜는 샘플링 프로파일러 (ERASEME_PROFILE=1)
+PROFILE_ENABLED = os.getenv("ERASEME_PROFILE", "0") == "1"
+PROFILE_INTERVAL_MS = float(os.getenv("ERASEME_PROFILE_INTERVAL_MS", "10"))
+PROFILE_SLOW_MS = float(os.getenv("ERASEME_PROFILE_SLOW_MS", "1000"))
+
+_component = None
+_logger = None
+_profiler = None
+_lock = threading.Lock()
+
+
+def configure(component):
+    global _component
+    _component = component
+
+
+def component_name():
+    if _component:
+        return _component
+    return os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+
+
+def _get_logger():
+    global _logger, _profiler
+    if _logger is not None:
+        return _logger
+    with _lock:
+        if _logger is None:
+            name = component_name()
+            logger = logging.getLogger(f"eraseme.metrics.{name}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            try:
+                os.makedirs(METRICS_DIR, exist_ok=True)
+                handler = RotatingFileHandler(
+                    os.path.join(METRICS_DIR, f"{name}.jsonl"),
+                    maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8"
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+            except OSError as e:
+                print(f"❌ 지표 파일 생성 실패: {e}")
+                logger.addHandler(logging.NullHandler())
+            if PROFILE_ENABLED and _profiler is None:
+                _profiler = SamplingProfiler(PROFILE_INTERVAL_MS / 1000)
+                _profiler.start()
+            _logger = logger
+    return _logger
+
+
+def record(kind, name, **fields):
+    entry = {"ts": round(time.time(), 3), "pid": os.getpid(), "component": component_name(),
+             "kind": kind, "name": name}
+    entry.update(fields)
+    try:
+        _get_logger().info(json.dumps(entry, ensure_ascii=False, default=str))
+    except Exception:
+        pass
+
+
+def record_span(name, ms, ok=True, **fields):
+    record("span", name, ms=round(ms, 3), ok=ok, **fields)
+
+
+def count(name, value=1, **fields):
+    record("counter", name, value=value, **fields)
+
+
+@contextmanager
+def span(name, **fields):
+    # 호출 측에서 info["error"] 를 채우면 예외 없이도 실패로 기록됨
+    info = dict(fields)
+    start = time.perf_counter()
+    try:
+        yield info
+    except Exception as e:
+        info.setdefault("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        end = time.perf_counter()
+        ms = (end - start) * 1000
+        record_span(name, ms, ok="error" not in info, **info)
+        if _profiler is not None and ms >= PROFILE_SLOW_MS:
+            _profiler.dump(name, threading.get_ident(), start, end)
+
+
+class SamplingProfiler(threading.Thread):
+    def __init__(self, interval, keep_seconds=60):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = collections.deque(maxlen=int(keep_seconds / interval))
+
+    def run(self):
+        own = threading.get_ident()
+        while True:
+            now = time.perf_counter()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < 64:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples.append((now, thread_id, ";".join(reversed(stack))))
+            time.sleep(self.interval)
+
+    def dump(self, name, thread_id, start, end):
+        stacks = collections.Counter(
+            stack for t, tid, stack in list(self.samples) if tid == thread_id and start <= t <= end
+        )
+        if not stacks:
+            return
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(METRICS_DIR, f"profile_{component_name()}_{name}_{timestamp}.txt")
+        try:
+            # flamegraph.pl / speedscope 에서 바로 열 수 있는 collapsed stack 형식
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, n in stacks.most_common():
+                    f.write(f"{stack} {n}\n")
+            record("profile", name, path=path, ms=round((end - start) * 1000, 3), samples=sum(stacks.values()))
+        except OSError as e:
+            print(f"❌ 프로파일 저장 실패: {e}")
+
+
+def load_records(since=None, metrics_dir=None):
+    records = []
+    for path in glob.glob(os.path.join(metrics_dir or METRICS_DIR, "*.jsonl*")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if since is None or entry.get("ts", 0) >= since:
+                        records.append(entry)
+        except OSError:
+            continue
+    return records
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(records, window_seconds):
+    stats = {}
+    for entry in records:
+        if entry.get("kind") not in ("span", "counter", "error"):
+            continue
+        key = (entry.get("component", "?"), entry.get("name", "?"))
+        row = stats.setdefault(key, {"component": key[0], "name": key[1], "count": 0,
+                                     "errors": 0, "total": 0, "durations": []})
+        if entry.get("kind") == "span":
+            row["count"] += 1
+            row["durations"].append(entry.get("ms", 0.0))
+            if not entry.get("ok", True):
+                row["errors"] += 1
+        elif entry.get("kind") == "counter":
+            row["total"] += entry.get("value", 1)
+        else:
+            row["errors"] += 1
+
+    rows = []
+    minutes = max(window_seconds / 60, 1e-9)
+    for row in stats.values():
+        durations = row.pop("durations")
+        row["p50"] = percentile(durations, 50)
+        row["p95"] = percentile(durations, 95)
+        row["per_minute"] = (row["count"] or row["total"]) / minutes
+        rows.append(row)
+    rows.sort(key=lambda r: (r["component"], r["name"]))
+    return rows
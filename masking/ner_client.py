@@ -0,0 +1,167 @@
+import os
+import time
+import threading
+from concurrent.futures import Future
+
+import instrumentation
+
+# 첫 텍스트가 들어온 뒤 이 시간 동안 함께 보낼 텍스트를 더 기다림
+# 0 이면 바로 보내고, 요청이 오가는 동안 들어온 텍스트만 다음 요청으로 묶음 (혼자 쓰는 경우 지연 없음)
+BATCH_WINDOW_MS = float(os.getenv("NER_BATCH_WINDOW_MS", "0"))
+MAX_BATCH_SIZE = int(os.getenv("NER_MAX_BATCH", "16"))
+MAX_BATCH_CHARS = int(os.getenv("NER_MAX_BATCH_CHARS", "20000"))
+# 여러 문서 요청({"texts": [...]})을 모르는 서버가 돌려주는 상태 코드
+UNSUPPORTED_STATUS = {400, 404, 405, 415, 422}
+# 한 건씩 요청은 되는데 묶음 요청만 이 횟수만큼 연속으로 실패하면 묶음 요청을 그만둠 (500 을 주는 서버 등)
+MAX_BATCH_FAILURES = 3
+
+
+class NerClient:
+    # 여러 호출자의 텍스트를 잠깐 모아 한 번의 요청으로 보내고, 결과를 나눠서 돌려줌
+    def __init__(self, url, window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH_SIZE, max_chars=MAX_BATCH_CHARS,
+                 timeout=60):
+        self.url = url
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self.max_chars = max_chars
+        self.timeout = timeout
+        # None: 아직 모름, True/False: 서버가 여러 문서 요청을 받는지
+        self.batching = None
+        self.batch_failures = 0
+        self.pending = []
+        self.flush = False
+        self.cond = threading.Condition()
+        self.thread = None
+        self.session = None
+
+    def submit(self, text):
+        future = Future()
+        with self.cond:
+            self.pending.append((time.monotonic(), text, future))
+            self._start()
+            self.cond.notify()
+        return future
+
+    def submit_many(self, texts):
+        # 한꺼번에 들어온 텍스트는 기다리지 않고 바로 보냄
+        futures = [Future() for _ in texts]
+        now = time.monotonic()
+        with self.cond:
+            self.pending.extend((now, text, future) for text, future in zip(texts, futures))
+            self.flush = True
+            self._start()
+            self.cond.notify()
+        return futures
+
+    def get_ner_result(self, text):
+        return self.submit(text).result()
+
+    def get_ner_results(self, texts):
+        return [future.result() for future in self.submit_many(texts)]
+
+    def _start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="ner-batch", daemon=True)
+            self.thread.start()
+
+    def _batch_full(self):
+        return (len(self.pending) >= self.max_batch
+                or sum(len(text) for _, text, _ in self.pending) >= self.max_chars)
+
+    def _take(self):
+        batch, chars = [], 0
+        while self.pending and len(batch) < self.max_batch:
+            text = self.pending[0][1]
+            if batch and chars + len(text) > self.max_chars:
+                break
+            batch.append(self.pending.pop(0))
+            chars += len(text)
+        if not self.pending:
+            self.flush = False
+        return batch
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                while not self.flush and not self._batch_full():
+                    remaining = self.pending[0][0] + self.window - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                batch = self._take()
+            self._send(batch)
+
+    def _send(self, batch):
+        texts = [text for _, text, _ in batch]
+        results = None
+        try:
+            if len(texts) > 1 and self.batching is not False:
+                results = self._post_batch(texts)
+            if results is None:
+                singles = [self._post_single(text) for text in texts]
+                if self.batch_failures >= MAX_BATCH_FAILURES and all(r is not None for r in singles):
+                    self._batching_unsupported(f"묶음 요청 {self.batch_failures}번 연속 실패")
+                results = [r if r is not None else [] for r in singles]
+        finally:
+            for i, (_, _, future) in enumerate(batch):
+                future.set_result(results[i] if results is not None else [])
+
+    def _post(self, payload):
+        if self.session is None:
+            import requests
+            self.session = requests.Session()
+        return self.session.post(self.url, json=payload, timeout=self.timeout)
+
+    def _post_batch(self, texts):
+        chars = sum(len(text) for text in texts)
+        with instrumentation.span("ner.request", chars=chars, texts=len(texts), batched=True) as info:
+            try:
+                response = self._post({"texts": texts})
+                if response.status_code in UNSUPPORTED_STATUS:
+                    info["error"] = f"HTTP {response.status_code}"
+                    self._batching_unsupported(f"HTTP {response.status_code}")
+                    return None
+                response.raise_for_status()
+                results = response.json().get("ner_results")
+                if not isinstance(results, list) or len(results) != len(texts):
+                    info["error"] = "ner_results 없음"
+                    self._batching_unsupported("응답에 ner_results 없음")
+                    return None
+            except Exception as e:
+                # 일시적인 오류는 이번 묶음만 한 건씩 다시 보냄
+                print(f"❌ NER 묶음 요청 실패: {e}")
+                info["error"] = str(e)
+                self.batch_failures += 1
+                return None
+        self.batching = True
+        self.batch_failures = 0
+        return results
+
+    def _batching_unsupported(self, reason):
+        self.batching = False
+        print(f"⚠️ NER 서버가 여러 문서 요청을 지원하지 않아 한 건씩 보냅니다 ({reason})")
+
+    def _post_single(self, text):
+        with instrumentation.span("ner.request", chars=len(text), texts=1, batched=False) as info:
+            try:
+                response = self._post({"text": text})
+                response.raise_for_status()
+                return response.json()["ner_result"]
+            except Exception as e:
+                print(f"❌ 서버 요청 실패: {e}")
+                info["error"] = str(e)
+                return None
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(url):
+    with _clients_lock:
+        client = _clients.get(url)
+        if client is None:
+            client = _clients[url] = NerClient(url)
+    return client
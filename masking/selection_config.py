@@ -0,0 +1,168 @@
+import os
+import json
+import tempfile
+import time
+import threading
+
+SELECTION_FILE = "selected_fields.json"
+WATCH_INTERVAL = 0.5
+
+SELECTION_MASKING = {
+    "이름": {"PERSON"},
+    "날짜": {"DATE"},
+    "시간": {"TIME"},
+    "장소": {"LOCATION"},
+    "기관": {"ORGANIZATION"},
+    "이메일": {"EMAIL"},
+    "전화번호": {"PHONE"},
+    "주민등록번호": {"SSN"}
+}
+
+
+class Selection:
+    # 한 요청 안에서는 같은 스냅샷을 끝까지 쓰도록 바꾸지 않는 객체로 둠
+    __slots__ = ("version", "fields", "tags")
+
+    def __init__(self, version, fields):
+        self.version = version
+        self.fields = tuple(fields)
+        tags = set()
+        for field in self.fields:
+            tags.update(SELECTION_MASKING.get(field, set()))
+        self.tags = frozenset(tags)
+
+    def __repr__(self):
+        return f"Selection(version={self.version}, fields={list(self.fields)})"
+
+
+EMPTY = Selection(0, ())
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def read_selection(file=SELECTION_FILE):
+    try:
+        with open(file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return EMPTY
+    # 예전 형식(필드 목록만 저장)도 읽음
+    if isinstance(data, list):
+        return Selection(1, data)
+    return Selection(data.get("version", 1), data.get("fields", []))
+
+
+class SelectionWatcher(threading.Thread):
+    # 선택 파일을 주기적으로 stat 해서 바뀌었을 때만 다시 읽음 (마스킹 경로에서는 파일을 열지 않음)
+    def __init__(self, file, interval=WATCH_INTERVAL):
+        super().__init__(daemon=True)
+        self.file = file
+        self.interval = interval
+        self.listeners = []
+        self.lock = threading.Lock()
+        self.signature = _signature(file)
+        self.current = read_selection(file)
+        _remember_version(file, self.current.version)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            self.check()
+
+    def check(self):
+        signature = _signature(self.file)
+        if signature == self.signature:
+            return
+        self.update(read_selection(self.file), signature)
+
+    def update(self, selection, signature):
+        with self.lock:
+            self.signature = signature
+            changed = selection.fields != self.current.fields or selection.version != self.current.version
+            self.current = selection
+        _remember_version(self.file, selection.version)
+        if changed:
+            print(f"🔄 마스킹 대상 변경 감지 (v{selection.version}): {list(selection.fields)}")
+            for callback in list(self.listeners):
+                try:
+                    callback(selection)
+                except Exception as e:
+                    print(f"❌ 선택 변경 알림 실패: {e}")
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+# 파일별로 지금까지 본 가장 큰 버전 (선택을 지운 뒤 다시 저장해도 버전이 줄어들지 않게 함)
+_versions = {}
+
+
+def _remember_version(file, version):
+    key = os.path.abspath(file)
+    _versions[key] = max(_versions.get(key, 0), version)
+    return _versions[key]
+
+
+def get_watcher(file=SELECTION_FILE):
+    key = os.path.abspath(file)
+    watcher = _watchers.get(key)
+    if watcher is None:
+        with _watchers_lock:
+            watcher = _watchers.get(key)
+            if watcher is None:
+                watcher = SelectionWatcher(file)
+                watcher.start()
+                _watchers[key] = watcher
+    return watcher
+
+
+def current_selection(file=SELECTION_FILE):
+    return get_watcher(file).current
+
+
+def subscribe(callback, file=SELECTION_FILE):
+    # callback(selection) 은 감시 스레드에서 불림
+    get_watcher(file).listeners.append(callback)
+
+
+def has_selection(file=SELECTION_FILE):
+    return os.path.exists(file)
+
+
+def save_selection(fields, file=SELECTION_FILE):
+    selection = Selection(_remember_version(file, read_selection(file).version) + 1, fields)
+    _remember_version(file, selection.version)
+    data = {"version": selection.version, "fields": list(selection.fields)}
+
+    # 임시 파일에 쓴 뒤 교체해서 다른 프로세스가 쓰다 만 파일을 읽지 않도록 함
+    directory = os.path.dirname(os.path.abspath(file))
+    fd, tmp_path = tempfile.mkstemp(prefix=".selected_fields.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    watcher = _watchers.get(os.path.abspath(file))
+    if watcher is not None:
+        watcher.update(selection, _signature(file))
+    return selection
+
+
+def clear_selection(file=SELECTION_FILE):
+    if os.path.exists(file):
+        _remember_version(file, read_selection(file).version)
+        os.remove(file)
+    watcher = _watchers.get(os.path.abspath(file))
+    if watcher is not None:
+        watcher.update(EMPTY, None)
@@ -0,0 +1,319 @@
+import re
+import json
+import collections
+
+# NER 서버로 한 번에 보내는 최대 글자 수 (값들을 줄바꿈으로 이어 붙여 보냄)
+NER_CHUNK_CHARS = 4000
+CSV_DELIMITERS = ",\t;|"
+# CSV 로 보려면 헤더 + 데이터 2줄 이상 (쉼표가 들어간 보통 글을 CSV 로 잘못 보지 않도록)
+CSV_MIN_LINES = 3
+
+# 필드 이름만 보고 모델 없이 통째로 가리는 항목 (소문자, 기호 제거 후 비교)
+FIELD_TAGS = {}
+for _names, _tag in [
+    (["name", "fullname", "firstname", "lastname", "username", "customername",
+      "이름", "성명", "성함", "고객명", "작성자", "담당자", "수령인"], "PERSON"),
+    (["email", "emailaddress", "mail", "이메일", "메일"], "EMAIL"),
+    (["phone", "phonenumber", "tel", "telephone", "mobile", "cellphone",
+      "전화", "전화번호", "휴대폰", "휴대폰번호", "연락처"], "PHONE"),
+    (["ssn", "rrn", "residentnumber", "주민번호", "주민등록번호"], "SSN"),
+    (["address", "addr", "streetaddress", "주소", "배송지", "거주지"], "LOCATION"),
+    (["birthday", "birthdate", "dateofbirth", "dob", "생일", "생년월일"], "DATE"),
+    (["company", "organization", "org", "employer", "회사", "회사명", "소속", "기관"], "ORGANIZATION"),
+]:
+    for _name in _names:
+        FIELD_TAGS[_name] = _tag
+
+Segment = collections.namedtuple("Segment", "start end key value kind")
+
+JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+JSON_COLON = re.compile(r'\s*:')
+HEADER_CELL = re.compile(r'[^\W\d][\w.\-]*')
+KV_PAIR = re.compile(r'(?<![\w.\-])([^\W\d][\w.\-]*)=("(?:[^"\\]|\\.)*"|[^\s",]+)')
+NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+PLACEHOLDER = re.compile(r'\[[A-Z]+_[a-f0-9]{8}\]')
+LETTERS = re.compile(r'[^\W\d_]')
+
+
+def normalize_field(name):
+    name = name.rsplit(".", 1)[-1].lower()
+    return re.sub(r'[^0-9a-z가-힣]', '', name)
+
+
+def known_field_tag(name):
+    return FIELD_TAGS.get(normalize_field(name))
+
+
+def parse_fields(value):
+    # "message, note" 같은 설정값 -> NER 로 보낼 필드 집합 (비어 있으면 제한 없음)
+    if not value or not value.strip():
+        return None
+    return frozenset(normalize_field(name) for name in value.split(",") if name.strip())
+
+
+def _lines(text):
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        yield offset, line.rstrip("\r\n")
+        offset += len(line)
+
+
+def is_json(text):
+    stripped = text.strip()
+    if not stripped or stripped[0] not in "{[":
+        return False
+    try:
+        json.loads(stripped)
+    except ValueError:
+        return False
+    return True
+
+
+def is_json_lines(text):
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if len(lines) < 2:
+        return False
+    for line in lines:
+        if not line.startswith("{"):
+            return False
+        try:
+            json.loads(line)
+        except ValueError:
+            return False
+    return True
+
+
+def is_header_row(cells):
+    # 헤더 칸은 공백 없는 이름(user_id, 이메일 등)이거나 알려진 필드 이름이어야 함
+    names = []
+    for _, _, cell in cells:
+        if len(cell) >= 2 and cell[0] == '"' and cell[-1] == '"':
+            cell = cell[1:-1]
+        if not (HEADER_CELL.fullmatch(cell) or known_field_tag(cell)):
+            return False
+        names.append(cell)
+    return len(set(names)) == len(names)
+
+
+def sniff_csv(text):
+    lines = [line for _, line in _lines(text) if line.strip()]
+    if len(lines) < CSV_MIN_LINES:
+        return None
+    header = lines[0]
+    for delimiter in CSV_DELIMITERS:
+        # 모든 줄에 헤더만큼 구분자가 있는지 먼저 세어 봄 (따옴표 안의 구분자 때문에 더 많을 수는 있음)
+        count = header.count(delimiter)
+        if not count or any(line.count(delimiter) < count for line in lines):
+            continue
+        cells = split_cells(header, 0, delimiter)
+        if cells is None or not is_header_row(cells):
+            continue
+        if all(len(split_cells(line, 0, delimiter) or ()) == len(cells) for line in lines[1:]):
+            return delimiter
+    return None
+
+
+def is_pair_line(line):
+    # 키=값 이 줄의 절반 이상을 차지하는 줄 (문장 중간에 a=1 이 섞인 줄은 아님)
+    covered = sum(len(m.group(0)) for m in KV_PAIR.finditer(line))
+    return covered > 0 and covered * 2 >= len(line.strip())
+
+
+def is_kv_log(text):
+    lines = [line for line in text.splitlines() if line.strip()]
+    if len(lines) < 2:
+        return False
+    return sum(1 for line in lines if is_pair_line(line)) * 2 > len(lines)
+
+
+def _detect(text):
+    # (형식, CSV 구분자)
+    if is_json(text):
+        return "json", None
+    if is_json_lines(text):
+        return "jsonl", None
+    delimiter = sniff_csv(text)
+    if delimiter:
+        return "csv", delimiter
+    if is_kv_log(text):
+        return "kv", None
+    return None, None
+
+
+def detect_format(text):
+    return _detect(text)[0]
+
+
+def scan_json(text, delimiter=None):
+    # 문자열 리터럴만 한 번 훑으면서 가장 가까운 키를 따라감 (숫자/true/null 은 보지 않음)
+    segments = []
+    stack = []
+    key = None
+    for m in JSON_TOKEN.finditer(text):
+        token = m.group(0)
+        if token in "{[":
+            stack.append((token, key))
+        elif token in "}]":
+            if stack:
+                stack.pop()
+        elif JSON_COLON.match(text, m.end()):
+            key = json.loads(token)
+            # 키 자체에 이름 등이 들어 있을 수 있으므로 키도 후보로 둠 ({"홍길동": 95})
+            segments.append(Segment(m.start(), m.end(), None, key, "json"))
+        else:
+            owner = key if stack and stack[-1][0] == "{" else (stack[-1][1] if stack else None)
+            segments.append(Segment(m.start(), m.end(), owner, json.loads(token), "json"))
+    return segments
+
+
+def split_cells(line, offset, delimiter):
+    pattern = re.compile(r'"(?:[^"]|"")*"|[^%s]*' % re.escape(delimiter))
+    cells, pos = [], 0
+    while True:
+        m = pattern.match(line, pos)
+        cells.append((offset + m.start(), offset + m.end(), m.group(0)))
+        pos = m.end()
+        if pos >= len(line):
+            return cells
+        if line[pos] != delimiter:
+            return None
+        pos += 1
+
+
+def scan_csv(text, delimiter):
+    segments = []
+    header = None
+    for offset, line in _lines(text):
+        if not line.strip():
+            continue
+        cells = split_cells(line, offset, delimiter)
+        if header is None:
+            header = [cell.strip().strip('"') for _, _, cell in cells]
+            # 헤더 칸도 필드 이름 없는 글로 후보에 넣음
+            keys = [None] * len(cells)
+        else:
+            keys = header
+        for i, (start, end, cell) in enumerate(cells):
+            key = keys[i] if i < len(keys) else None
+            if len(cell) >= 2 and cell[0] == '"' and cell[-1] == '"':
+                segments.append(Segment(start, end, key, cell[1:-1].replace('""', '"'), "csv_quoted"))
+            else:
+                segments.append(Segment(start, end, key, cell, "raw"))
+    return segments
+
+
+def scan_kv(text, delimiter=None):
+    segments = []
+    for offset, line in _lines(text):
+        pos = 0
+        for m in KV_PAIR.finditer(line):
+            # 키=값 사이에 남은 글(타임스탬프, 메시지 등)도 후보로 둠
+            rest = line[pos:m.start()]
+            if LETTERS.search(rest):
+                segments.append(Segment(offset + pos, offset + m.start(), None, rest, "raw"))
+            pos = m.end()
+            value = m.group(2)
+            start, end = offset + m.start(2), offset + m.end(2)
+            if value.startswith('"'):
+                segments.append(Segment(start, end, m.group(1), re.sub(r'\\(.)', r'\1', value[1:-1]), "kv_quoted"))
+            else:
+                segments.append(Segment(start, end, m.group(1), value, "raw"))
+        # 마지막 키=값 뒤에 남은 글 (키=값 이 없는 줄은 통째로)
+        rest = line[pos:]
+        if LETTERS.search(rest):
+            segments.append(Segment(offset + pos, offset + len(line), None, rest, "raw"))
+    return segments
+
+
+SCANNERS = {"json": scan_json, "jsonl": scan_json, "csv": scan_csv, "kv": scan_kv}
+
+ENCODERS = {
+    "json": lambda value: json.dumps(value, ensure_ascii=False),
+    "csv_quoted": lambda value: '"' + value.replace('"', '""') + '"',
+    "kv_quoted": lambda value: '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"',
+    "raw": lambda value: value,
+}
+
+
+def chunk_values(values, chunk_chars=NER_CHUNK_CHARS):
+    chunk, size = [], 0
+    for value in values:
+        if chunk and size + len(value) + 1 > chunk_chars:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(value)
+        size += len(value) + 1
+    if chunk:
+        yield chunk
+
+
+def mask_structured(text, mask_tags, detect, replace, field_tag=known_field_tag, fields=None,
+                    chunk_chars=NER_CHUNK_CHARS, detect_many=None, mask_free=None):
+    # JSON/CSV/키=값 로그면 문자열 값만 골라서 가림. 구조화된 텍스트가 아니면 None
+    # detect(text) -> [(단어, 태그)], replace(태그, 단어) -> 치환 문자열
+    # detect_many(texts) 가 있으면 나눈 조각들을 한 번에 넘김 (여러 문서 요청)
+    # mask_free(text) 가 있으면 필드 이름 없는 글(헤더, JSON 키, 키=값 줄의 나머지)은 detect 대신 이걸로 가림
+    fmt, delimiter = _detect(text)
+    if fmt is None:
+        return None
+
+    segments = SCANNERS[fmt](text, delimiter)
+    replaced = {}
+
+    def replace_once(tag, word):
+        if (tag, word) not in replaced:
+            replaced[tag, word] = replace(tag, word)
+        return replaced[tag, word]
+
+    masked = {}
+    candidates = {}
+    for i, seg in enumerate(segments):
+        value = seg.value.strip()
+        if not value or NUMBER.fullmatch(value) or PLACEHOLDER.fullmatch(value):
+            continue
+        if seg.key is None and mask_free is not None:
+            new_value = mask_free(seg.value)
+            if new_value != seg.value:
+                masked[i] = new_value
+            continue
+        tag = field_tag(seg.key) if seg.key else None
+        if tag:
+            if tag in mask_tags:
+                masked[i] = replace_once(tag, seg.value)
+            continue
+        # 필드 이름이 없는 글(키=값 줄의 나머지 등)은 필드 목록과 관계없이 NER 로 보냄
+        if fields is not None and seg.key is not None and normalize_field(seg.key) not in fields:
+            continue
+        candidates.setdefault(seg.value, []).append(i)
+
+    stats = {"format": fmt, "values": len(segments), "by_field": len(masked),
+             "ner_values": len(candidates), "ner_calls": 0, "ner_chars": 0}
+
+    # 여러 레코드의 값을 모아 NER 호출 한 번에 보냄 (같은 값은 한 번만)
+    chunks = list(chunk_values(list(candidates), chunk_chars))
+    joined = ["\n".join(chunk) for chunk in chunks]
+    stats["ner_calls"] = len(joined)
+    stats["ner_chars"] = sum(len(text) for text in joined)
+    if detect_many and len(joined) > 1:
+        results = detect_many(joined)
+    else:
+        results = [detect(text) for text in joined]
+
+    for chunk, result in zip(chunks, results):
+        for value in chunk:
+            new_value = value
+            for word, tag in result:
+                if tag in mask_tags and word and word in new_value:
+                    new_value = new_value.replace(word, replace_once(tag, word))
+            if new_value != value:
+                for i in candidates[value]:
+                    masked[i] = new_value
+
+    parts, pos = [], 0
+    for i in sorted(masked):
+        seg = segments[i]
+        parts.append(text[pos:seg.start])
+        parts.append(ENCODERS[seg.kind](masked[i]))
+        pos = seg.end
+    parts.append(text[pos:])
+    return "".join(parts), stats
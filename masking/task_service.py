@@ -0,0 +1,153 @@
+import os
+import threading
+import itertools
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+MAX_WORKERS = int(os.getenv("ERASEME_MAX_WORKERS", "4"))
+# 그룹별 동시 실행 수 (없는 그룹은 스레드 풀 크기까지)
+DEFAULT_LIMITS = {"upload": 3, "image": 1, "audio": 1, "metrics": 1}
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self, service, task_id, group):
+        self.service = service
+        self.id = task_id
+        self.group = group
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def progress(self, value):
+        self.service.progressed.emit(self.id, value)
+
+    def sleep(self, seconds):
+        # 취소되면 바로 깨어나서 TaskCancelled 를 던짐
+        if self.cancel_event.wait(seconds):
+            raise TaskCancelled()
+
+
+class TaskService(QObject):
+    # 네트워크/파일 작업을 고정된 스레드 풀에서 실행하고, 결과와 진행 상황은 Qt 시그널로 UI 스레드에 돌려줌
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+    progressed = pyqtSignal(int, object)
+    cancelled = pyqtSignal(int)
+
+    def __init__(self, max_workers=MAX_WORKERS, limits=None, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eraseme")
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.callbacks = {}
+        self.tasks = {}
+        self.pending = collections.defaultdict(collections.deque)
+        self.running = collections.defaultdict(int)
+
+        self.finished.connect(self._on_finished)
+        self.failed.connect(self._on_failed)
+        self.progressed.connect(self._on_progress)
+        self.cancelled.connect(self._on_cancelled)
+
+    def submit(self, fn, *args, group="default", on_done=None, on_error=None, on_progress=None,
+               on_cancel=None, **kwargs):
+        # fn 은 첫 인자로 Task 를 받아 task.progress()/task.check_cancelled() 를 쓸 수 있음
+        task = Task(self, next(self.ids), group)
+        self.callbacks[task.id] = (on_done, on_error, on_progress, on_cancel)
+        with self.lock:
+            self.tasks[task.id] = task
+            self.pending[group].append((task, fn, args, kwargs))
+        self._dispatch(group)
+        return task
+
+    def _dispatch(self, group):
+        with self.lock:
+            limit = self.limits.get(group)
+            while self.pending[group] and (limit is None or self.running[group] < limit):
+                job = self.pending[group].popleft()
+                self.running[group] += 1
+                self.executor.submit(self._run, *job)
+
+    def _run(self, task, fn, args, kwargs):
+        try:
+            task.check_cancelled()
+            result = fn(task, *args, **kwargs)
+            task.check_cancelled()
+        except TaskCancelled:
+            self.cancelled.emit(task.id)
+        except Exception as e:
+            self.failed.emit(task.id, e)
+        else:
+            self.finished.emit(task.id, result)
+        finally:
+            with self.lock:
+                self.running[task.group] -= 1
+            self._dispatch(task.group)
+
+    def _pop(self, task_id):
+        with self.lock:
+            self.tasks.pop(task_id, None)
+        return self.callbacks.pop(task_id, (None, None, None, None))
+
+    def _on_finished(self, task_id, result):
+        on_done = self._pop(task_id)[0]
+        if on_done:
+            on_done(result)
+
+    def _on_failed(self, task_id, error):
+        on_error = self._pop(task_id)[1]
+        if on_error:
+            on_error(error)
+
+    def _on_progress(self, task_id, value):
+        on_progress = self.callbacks.get(task_id, (None, None, None, None))[2]
+        if on_progress:
+            on_progress(value)
+
+    def _on_cancelled(self, task_id):
+        on_cancel = self._pop(task_id)[3]
+        if on_cancel:
+            on_cancel()
+
+    def active_count(self, group=None):
+        with self.lock:
+            return sum(1 for task in self.tasks.values() if group is None or task.group == group)
+
+    def cancel_group(self, group):
+        with self.lock:
+            tasks = [task for task in self.tasks.values() if task.group == group]
+        for task in tasks:
+            task.cancel()
+
+    def shutdown(self):
+        with self.lock:
+            tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_default = None
+
+
+def default_service():
+    global _default
+    if _default is None:
+        _default = TaskService()
+    return _default
@@ -1,20 +1,22 @@
 import os
 import sys
 import json
-import pyperclip
 import time
 import re
 import uuid
-import requests
 import atexit
-import psutil
 from dotenv import load_dotenv
+import instrumentation
+from selection_config import current_selection
+from structured_masking import mask_structured, parse_fields
+from ner_client import get_client
 
 LOCK_FILE = "text_masking.lock"
 
 def is_already_running():
     if not os.path.exists(LOCK_FILE):
         return False
+    import psutil
     try:
         with open(LOCK_FILE, "r") as f:
             pid = int(f.read())
@@ -43,87 +45,88 @@ def resource_path(relative_path):
 load_dotenv(dotenv_path=resource_path(".env"))
 server_url = os.getenv("TEXT_MASKING_SERVER_URL")
 MASK_CACHE_FILE = "masking_record_text.json"
+# JSON/CSV/키=값 로그는 문자열 값만 NER 로 보냄 (STRUCTURED_MASKING=0 이면 항상 전체 전송)
+STRUCTURED_MASKING = os.getenv("STRUCTURED_MASKING", "1") != "0"
+# 설정하면 이 필드(열)의 값만 NER 로 보냄. 예: STRUCTURED_MASK_FIELDS=message,memo
+STRUCTURED_MASK_FIELDS = parse_fields(os.getenv("STRUCTURED_MASK_FIELDS"))
 
-SELECTION_MASKING = {
-    "이름": {"PERSON"},
-    "날짜": {"DATE"},
-    "시간": {"TIME"},
-    "장소": {"LOCATION"},
-    "기관": {"ORGANIZATION"},
-    "이메일": {"EMAIL"},
-    "전화번호": {"PHONE"},
-    "주민등록번호": {"SSN"}
-}
 MASK_CACHE = {}
 
 def save_mask_cache():
-    with open(MASK_CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(MASK_CACHE, f, ensure_ascii=False, indent=2)
+    with instrumentation.span("mask_store.save", entries=len(MASK_CACHE)):
+        with open(MASK_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(MASK_CACHE, f, ensure_ascii=False, indent=2)
 
 def load_mask_cache():
     global MASK_CACHE
     if os.path.exists(MASK_CACHE_FILE):
-        with open(MASK_CACHE_FILE, "r", encoding="utf-8") as f:
-            MASK_CACHE = json.load(f)
+        with instrumentation.span("mask_store.load") as info:
+            with open(MASK_CACHE_FILE, "r", encoding="utf-8") as f:
+                MASK_CACHE = json.load(f)
+            info["entries"] = len(MASK_CACHE)
 
 def generate_uid():
     return str(uuid.uuid4())[:8]
 
 def get_ner_result(text):
-    try:
-        response = requests.post(server_url, json={"text": text}, timeout=60)
-        response.raise_for_status()
-        return response.json()["ner_result"]
-    except Exception as e:
-        print(f"❌ 서버 요청 실패: {e}")
-        return []
-    
-def load_mask_tags_from_selection(file="selected_fields.json"):
-    if not os.path.exists(file):
-        return set()
-    with open(file, "r", encoding="utf-8") as f:
-        user_selections = json.load(f)
-
-    mask_tags = set()
-    for sel in user_selections:
-        mask_tags.update(SELECTION_MASKING.get(sel, set()))
-    return mask_tags
+    return get_client(server_url).get_ner_result(text)
+
+def get_ner_results(texts):
+    return get_client(server_url).get_ner_results(texts)
 
 def mask_text_with_cache(text):
-    mask_tags = load_mask_tags_from_selection()
-    result = get_ner_result(text)
-    masked_text = text
+    with instrumentation.span("text.mask", chars=len(text)):
+        return _mask_text_with_cache(text)
+
+def add_to_cache_and_replace(tag, word):
+    for k, (t, v) in MASK_CACHE.items():
+        if t == tag and v == word:
+            return f"[{tag}_{k}]"
+    uid = generate_uid()
+    MASK_CACHE[uid] = (tag, word)
+    return f"[{tag}_{uid}]"
+
+def mask_with_regex(masked_text, mask_tags):
+    with instrumentation.span("regex"):
+        if "EMAIL" in mask_tags:
+            for email in re.findall(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+', masked_text):
+                masked_text = masked_text.replace(email, add_to_cache_and_replace("EMAIL", email))
+
+        if "PHONE" in mask_tags:
+            for phone in re.findall(r'01[016789]-\d{3,4}-\d{4}', masked_text):
+                masked_text = masked_text.replace(phone, add_to_cache_and_replace("PHONE", phone))
+
+        if "SSN" in mask_tags:
+            for ssn in re.findall(r'\d{6}-\d{7}', masked_text):
+                masked_text = masked_text.replace(ssn, add_to_cache_and_replace("SSN", ssn))
+    return masked_text
+
+def _mask_text_with_cache(text):
+    mask_tags = current_selection().tags
 
     global MASK_CACHE
 
     if not MASK_CACHE:
-        if os.path.exists(MASK_CACHE_FILE):
-            with open(MASK_CACHE_FILE, "r", encoding="utf-8") as f:
-                MASK_CACHE = json.load(f)
-
-    def add_to_cache_and_replace(tag, word):
-        for k, (t, v) in MASK_CACHE.items():
-            if t == tag and v == word:
-                return f"[{tag}_{k}]"
-        uid = generate_uid()
-        MASK_CACHE[uid] = (tag, word)
-        return f"[{tag}_{uid}]"
-
-    for word, tag in result:
-        if tag in mask_tags and word in masked_text:
-            masked_text = masked_text.replace(word, add_to_cache_and_replace(tag, word))
-
-    if "EMAIL" in mask_tags:
-        for email in re.findall(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+', masked_text):
-            masked_text = masked_text.replace(email, add_to_cache_and_replace("EMAIL", email))
-
-    if "PHONE" in mask_tags:
-        for phone in re.findall(r'01[016789]-\d{3,4}-\d{4}', masked_text):
-            masked_text = masked_text.replace(phone, add_to_cache_and_replace("PHONE", phone))
+        load_mask_cache()
+
+    structured = None
+    if STRUCTURED_MASKING:
+        with instrumentation.span("text.structured") as info:
+            structured = mask_structured(text, mask_tags, get_ner_result, add_to_cache_and_replace,
+                                         fields=STRUCTURED_MASK_FIELDS, detect_many=get_ner_results)
+            if structured:
+                info.update(structured[1])
+
+    if structured:
+        masked_text = structured[0]
+    else:
+        result = get_ner_result(text)
+        masked_text = text
+        for word, tag in result:
+            if tag in mask_tags and word in masked_text:
+                masked_text = masked_text.replace(word, add_to_cache_and_replace(tag, word))
 
-    if "SSN" in mask_tags:
-        for ssn in re.findall(r'\d{6}-\d{7}', masked_text):
-            masked_text = masked_text.replace(ssn, add_to_cache_and_replace("SSN", ssn))
+    masked_text = mask_with_regex(masked_text, mask_tags)
 
     save_mask_cache()
     return masked_text
@@ -139,22 +142,27 @@ def partial_unmask(text):
     return restored
 
 def main():
+    import pyperclip
     print("📋 text_masking 클립보드 감시 중...")
     last_clip = pyperclip.paste()
 
     try:
         while True:
+            read_start = time.perf_counter()
             current_clip = pyperclip.paste()
+            read_ms = (time.perf_counter() - read_start) * 1000
 
             if current_clip.strip() == "":
                 time.sleep(0.3)
                 continue
 
             if current_clip != last_clip:
+                instrumentation.record_span("clipboard.read", read_ms, chars=len(current_clip))
                 if re.search(r'\[([A-Z]+)_([a-f0-9]{8})\]', current_clip):
                     print("\n♻️ 마스킹된 텍스트 감지 → 역마스킹")
-                    load_mask_cache()
-                    restored = partial_unmask(current_clip)
+                    with instrumentation.span("text.unmask", chars=len(current_clip)):
+                        load_mask_cache()
+                        restored = partial_unmask(current_clip)
                     pyperclip.copy(restored)
                     print("✅ 복원 후 클립보드에 저장됨:\n", restored)
                     last_clip = restored
@@ -170,9 +178,18 @@ def main():
 
     except Exception as e:
         print(f"❌ 예외 발생: {e}")
+        instrumentation.record("error", "text_masking.main", error=str(e))
         input("Press Enter to exit...")
 
+def wait_for_start():
+    # GUI 가 미리 띄워 둔 대기 프로세스: 무거운 모듈만 불러 두고 시작 신호(표준 입력 한 줄)를 기다림
+    import pyperclip, psutil, requests
+    if sys.stdin is None or not sys.stdin.readline():
+        sys.exit()
+
 if __name__ == "__main__":
+    if "--standby" in sys.argv:
+        wait_for_start()
     if is_already_running():
         sys.exit()
     create_lock()
@@ -0,0 +1,122 @@
+import io
+import hashlib
+
+TILE_SIZE = 64
+MAX_RECENT = 4
+# 변경된 영역이 전체의 이 비율을 넘으면 잘라 보내지 않고 전체 이미지를 보냄
+FULL_UPLOAD_RATIO = 0.6
+# 변경 영역은 화면 폭 전체의 가로 띠로 보내고 (글 줄이 좌우로 잘리지 않게),
+# 위아래로 한 줄 높이 이상 넓혀서 경계에 걸친 줄도 통째로 OCR 되게 함
+REGION_MARGIN = 32
+
+
+class TilePlan:
+    def __init__(self, kind, size, tags, hashes, box=None, base=None, image=None, base_image=None):
+        # kind: "full" (전체 업로드), "region" (변경 영역만 업로드), "reuse" (이전 결과 재사용)
+        # base/base_image: 이전 마스킹 결과와 그 원본, image: 이번 원본
+        self.kind = kind
+        self.size = size
+        self.tags = tags
+        self.hashes = hashes
+        self.box = box
+        self.base = base
+        self.image = image
+        self.base_image = base_image
+
+
+def encode_png(image):
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def tile_hashes(image, tile=TILE_SIZE):
+    width, height = image.size
+    hashes = []
+    for top in range(0, height, tile):
+        for left in range(0, width, tile):
+            box = (left, top, min(left + tile, width), min(top + tile, height))
+            hashes.append(hashlib.blake2b(image.crop(box).tobytes(), digest_size=16).digest())
+    return hashes
+
+
+def changed_box(changed, size, tile=TILE_SIZE, margin=REGION_MARGIN):
+    width, height = size
+    cols = (width + tile - 1) // tile
+    rows = [i // cols for i in changed]
+    top = max(min(rows) * tile - margin, 0)
+    bottom = min((max(rows) + 1) * tile + margin, height)
+    return (0, top, width, bottom)
+
+
+def _nonzero(diff):
+    return diff.point(lambda v: 255 if v else 0).convert("L").point(lambda v: 255 if v else 0)
+
+
+def kept_mask(base, base_image, image, box):
+    # 이전 결과에서 가려져 있었고(원본과 다름) 이번에도 원본이 그대로인 픽셀
+    # 잘린 영역 가장자리에서 OCR 이 놓친 글자가 다시 드러나지 않도록 이전 결과를 유지함
+    from PIL import ImageChops
+    before = base_image.crop(box).convert("RGB")
+    masked_before = _nonzero(ImageChops.difference(base.crop(box).convert("RGB"), before))
+    changed_now = _nonzero(ImageChops.difference(image.crop(box).convert("RGB"), before))
+    return ImageChops.subtract(masked_before, changed_now)
+
+
+class TileDiffCache:
+    def __init__(self, tile=TILE_SIZE, max_recent=MAX_RECENT, full_ratio=FULL_UPLOAD_RATIO):
+        self.tile = tile
+        self.max_recent = max_recent
+        self.full_ratio = full_ratio
+        self.recent = []
+
+    def plan(self, image, tags):
+        size = image.size
+        hashes = tile_hashes(image, self.tile)
+
+        best, changed = None, None
+        for entry in self.recent:
+            if entry["size"] != size or entry["tags"] != tags:
+                continue
+            diff = [i for i, (old, new) in enumerate(zip(entry["hashes"], hashes)) if old != new]
+            if changed is None or len(diff) < len(changed):
+                best, changed = entry, diff
+
+        if best is None:
+            return TilePlan("full", size, tags, hashes, image=image)
+        if not changed:
+            return TilePlan("reuse", size, tags, hashes, base=best["masked"], image=image)
+
+        box = changed_box(changed, size, self.tile)
+        area = (box[2] - box[0]) * (box[3] - box[1])
+        if area > size[0] * size[1] * self.full_ratio:
+            return TilePlan("full", size, tags, hashes, image=image)
+        return TilePlan("region", size, tags, hashes, box=box, base=best["masked"], image=image,
+                        base_image=best["image"])
+
+    def compose(self, plan, masked):
+        if plan.kind == "reuse":
+            return plan.base.copy()
+        if plan.kind == "full":
+            return masked
+
+        region_size = (plan.box[2] - plan.box[0], plan.box[3] - plan.box[1])
+        if masked.size != region_size:
+            masked = masked.resize(region_size)
+        result = plan.base.copy()
+        result.paste(masked.convert(result.mode), plan.box[:2])
+        if plan.base_image is not None:
+            keep = kept_mask(plan.base, plan.base_image, plan.image, plan.box)
+            result.paste(plan.base.crop(plan.box), plan.box[:2], keep)
+        return result
+
+    def remember(self, plan, masked):
+        if masked.size != plan.size or plan.image is None:
+            return
+        entry = {"size": plan.size, "tags": plan.tags, "hashes": plan.hashes, "masked": masked,
+                 "image": plan.image}
+        self.recent.insert(0, entry)
+        del self.recent[self.max_recent:]
+
+    def clear(self):
+        self.recent = []
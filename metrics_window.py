@@ -0,0 +1,94 @@
+import time
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import Qt, QTimer
+
+from masking import instrumentation
+from masking.task_service import default_service
+
+WINDOWS = [("최근 5분", 5 * 60), ("최근 15분", 15 * 60), ("최근 1시간", 60 * 60), ("최근 24시간", 24 * 60 * 60)]
+COLUMNS = ["구성 요소", "단계", "호출 수", "오류", "p50 (ms)", "p95 (ms)", "처리량 (/분)"]
+
+
+def load_summary(task, window_seconds):
+    records = instrumentation.load_records(since=time.time() - window_seconds)
+    return instrumentation.summarize(records, window_seconds), len(records)
+
+
+class MetricsWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Erase Me: 성능 지표")
+        self.resize(900, 500)
+
+        layout = QVBoxLayout()
+
+        top = QHBoxLayout()
+        self.window_box = QComboBox()
+        for label, _ in WINDOWS:
+            self.window_box.addItem(label)
+        self.window_box.currentIndexChanged.connect(self.refresh)
+        refresh_btn = QPushButton("새로고침")
+        refresh_btn.clicked.connect(self.refresh)
+        self.status_label = QLabel("")
+        top.addWidget(self.window_box)
+        top.addWidget(refresh_btn)
+        top.addStretch()
+        top.addWidget(self.status_label)
+        layout.addLayout(top)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        self.setLayout(layout)
+
+        self.tasks = default_service()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(2000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        # 기록 파일 읽기/집계는 작업 풀에서 하고, 이전 갱신이 끝나지 않았으면 건너뜀
+        if self.tasks.active_count("metrics"):
+            return
+        window_seconds = WINDOWS[self.window_box.currentIndex()][1]
+        self.tasks.submit(
+            load_summary, window_seconds,
+            group="metrics",
+            on_done=self.show_rows,
+            on_error=lambda e: self.status_label.setText(f"❌ 지표 읽기 실패: {e}")
+        )
+
+    def show_rows(self, result):
+        rows, record_count = result
+        self.table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            values = [
+                row["component"], row["name"], str(row["count"] or row["total"]), str(row["errors"]),
+                f"{row['p50']:.1f}" if row["count"] else "-",
+                f"{row['p95']:.1f}" if row["count"] else "-",
+                f"{row['per_minute']:.2f}",
+            ]
+            for j, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if j >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if j == 3 and row["errors"]:
+                    item.setForeground(Qt.red)
+                self.table.setItem(i, j, item)
+
+        self.status_label.setText(f"기록 {record_count}건 · {time.strftime('%H:%M:%S')} 갱신")
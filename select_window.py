@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QCheckBox, QPushButton, QGroupBox
 from PyQt5.QtCore import Qt
-import json
+from masking.selection_config import save_selection
 
 class SelectionWindow(QWidget):
     def __init__(self, next_callback):
@@ -59,8 +59,7 @@ class SelectionWindow(QWidget):
 
     def on_next_clicked(self):
         selected = self.get_selected_items()
-        with open("selected_fields.json", "w", encoding="utf-8") as f:
-            json.dump(selected, f, ensure_ascii=False, indent=2)
+        save_selection(selected)
         self.next_callback()
 
     def get_selected_items(self):